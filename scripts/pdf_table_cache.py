@@ -0,0 +1,93 @@
+"""
+On-disk cache for pdfplumber table extraction results.
+
+Parsing a PDF page and detecting its tables is the slow part of the
+experiment scripts, and the same PDFs are analysed over and over with the
+same settings. Results are pickled under ``.cache/pdf_tables/`` keyed by the
+PDF contents, page number, settings and pdfplumber version, so warm runs skip
+pdfplumber entirely. The PDF itself is only opened on a cache miss.
+
+Usage:
+    with PageTableCache(pdf_path, page_num=0) as cache:
+        tables = cache.get('extract_tables', settings,
+                           lambda page: page.extract_tables(table_settings=settings))
+"""
+import hashlib
+import json
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import pdfplumber
+
+DEFAULT_CACHE_DIR = Path(".cache") / "pdf_tables"
+
+
+class PageTableCache:
+    """Cache of per-page extraction results for a single PDF page."""
+
+    def __init__(self, pdf_path: Path, page_num: int = 0, cache_dir: Path = DEFAULT_CACHE_DIR):
+        self.pdf_path = Path(pdf_path)
+        self.page_num = page_num
+        self.cache_dir = Path(cache_dir)
+        self._pdf = None
+        self._pdf_digest: Optional[str] = None
+
+    def __enter__(self) -> 'PageTableCache':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying PDF if it was opened."""
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    @property
+    def page(self):
+        """The pdfplumber page, opened lazily on first access."""
+        if self._pdf is None:
+            self._pdf = pdfplumber.open(self.pdf_path)
+        return self._pdf.pages[self.page_num]
+
+    def _key(self, kind: str, settings: Dict[str, Any]) -> str:
+        """Cache key for a computation on this page with the given settings."""
+        if self._pdf_digest is None:
+            self._pdf_digest = hashlib.sha256(self.pdf_path.read_bytes()).hexdigest()
+
+        payload = json.dumps(
+            [self._pdf_digest, self.page_num, kind, settings, pdfplumber.__version__],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, kind: str, settings: Dict[str, Any], compute: Callable[[Any], Any]) -> Any:
+        """
+        Return the cached result of ``compute(page)``, computing it on a miss.
+
+        Args:
+            kind: Name of the computation (part of the cache key)
+            settings: Table settings used by the computation
+            compute: Function receiving the pdfplumber page
+
+        Returns:
+            The (possibly cached) result
+        """
+        cache_file = self.cache_dir / f"{self._key(kind, settings)}.pkl"
+
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'rb') as f:
+                    return pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass  # Corrupt entry: recompute and overwrite
+
+        result = compute(self.page)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        return result
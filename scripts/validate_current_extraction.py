@@ -7,46 +7,58 @@ This will:
 3. Compare with PDF page 2 totals (ground truth)
 4. Show accuracy of current implementation
 """
+import io
 from pathlib import Path
 from src.extractors.pdf_extractor import LiquidationPDFExtractor
 import sys
 
 
 def validate_extraction(pdf_path: Path):
-    """Validate extraction against ground truth from PDF."""
-    print(f"\n{'='*100}")
-    print(f"VALIDATING: {pdf_path.name}")
-    print(f"{'='*100}\n")
+    """
+    Validate extraction against ground truth from PDF.
+
+    The report is buffered rather than printed line by line, so callers can
+    emit it with a single write.
+
+    Returns:
+        Tuple of (result dict, report text)
+    """
+    out = io.StringIO()
+    write = out.write
+
+    write(f"\n{'='*100}\n")
+    write(f"VALIDATING: {pdf_path.name}\n")
+    write(f"{'='*100}\n\n")
 
     try:
         # Extract using YOUR current implementation
         extractor = LiquidationPDFExtractor(str(pdf_path))
         doc = extractor.extract()
 
-        print("EXTRACTION RESULTS (Your Current Implementation):")
-        print(f"{'-'*100}")
+        write("EXTRACTION RESULTS (Your Current Implementation):\n")
+        write(f"{'-'*100}\n")
 
-        print(f"\nHeader Info:")
-        print(f"  Ejercicio: {doc.ejercicio}")
-        print(f"  Mandamiento: {doc.mandamiento_pago}")
-        print(f"  Liquidacion: {doc.numero_liquidacion}")
-        print(f"  Entidad: {doc.entidad}")
+        write(f"\nHeader Info:\n")
+        write(f"  Ejercicio: {doc.ejercicio}\n")
+        write(f"  Mandamiento: {doc.mandamiento_pago}\n")
+        write(f"  Liquidacion: {doc.numero_liquidacion}\n")
+        write(f"  Entidad: {doc.entidad}\n")
 
-        print(f"\nTribute Records Found: {len(doc.tribute_records)}")
+        write(f"\nTribute Records Found: {len(doc.tribute_records)}\n")
 
         # Show first 5 records
-        print(f"\nFirst 5 Records:")
+        write(f"\nFirst 5 Records:\n")
         for i, rec in enumerate(doc.tribute_records[:5]):
-            print(f"\n  {i+1}. {rec.concepto}")
-            print(f"     Clave Contab: {rec.clave_contabilidad}")
-            print(f"     Clave Recaud: {rec.clave_recaudacion}")
-            print(f"     Voluntaria: {rec.voluntaria:,.2f}")
-            print(f"     Ejecutiva: {rec.ejecutiva:,.2f}")
-            print(f"     Liquido: {rec.liquido:,.2f}")
+            write(f"\n  {i+1}. {rec.concepto}\n")
+            write(f"     Clave Contab: {rec.clave_contabilidad}\n")
+            write(f"     Clave Recaud: {rec.clave_recaudacion}\n")
+            write(f"     Voluntaria: {rec.voluntaria:,.2f}\n")
+            write(f"     Ejecutiva: {rec.ejecutiva:,.2f}\n")
+            write(f"     Liquido: {rec.liquido:,.2f}\n")
 
-        print(f"\n{'-'*100}")
-        print("TOTALS (from individual records)")
-        print(f"{'-'*100}")
+        write(f"\n{'-'*100}\n")
+        write("TOTALS (from individual records)\n")
+        write(f"{'-'*100}\n")
 
         # Calculate from records
         calc_voluntaria = sum(r.voluntaria for r in doc.tribute_records)
@@ -54,24 +66,24 @@ def validate_extraction(pdf_path: Path):
         calc_recargo = sum(r.recargo for r in doc.tribute_records)
         calc_liquido = sum(r.liquido for r in doc.tribute_records)
 
-        print(f"  Voluntaria (sum):  {calc_voluntaria:>15,.2f} EUR")
-        print(f"  Ejecutiva (sum):   {calc_ejecutiva:>15,.2f} EUR")
-        print(f"  Recargo (sum):     {calc_recargo:>15,.2f} EUR")
-        print(f"  Liquido (sum):     {calc_liquido:>15,.2f} EUR")
+        write(f"  Voluntaria (sum):  {calc_voluntaria:>15,.2f} EUR\n")
+        write(f"  Ejecutiva (sum):   {calc_ejecutiva:>15,.2f} EUR\n")
+        write(f"  Recargo (sum):     {calc_recargo:>15,.2f} EUR\n")
+        write(f"  Liquido (sum):     {calc_liquido:>15,.2f} EUR\n")
 
-        print(f"\n{'-'*100}")
-        print("TOTALS (extracted from page 2)")
-        print(f"{'-'*100}")
+        write(f"\n{'-'*100}\n")
+        write("TOTALS (extracted from page 2)\n")
+        write(f"{'-'*100}\n")
 
-        print(f"  Voluntaria:        {doc.total_voluntaria:>15,.2f} EUR")
-        print(f"  Ejecutiva:         {doc.total_ejecutiva:>15,.2f} EUR")
-        print(f"  Recargo:           {doc.total_recargo:>15,.2f} EUR")
-        print(f"  Liquido:           {doc.total_liquido:>15,.2f} EUR")
-        print(f"  A Liquidar:        {doc.a_liquidar:>15,.2f} EUR")
+        write(f"  Voluntaria:        {doc.total_voluntaria:>15,.2f} EUR\n")
+        write(f"  Ejecutiva:         {doc.total_ejecutiva:>15,.2f} EUR\n")
+        write(f"  Recargo:           {doc.total_recargo:>15,.2f} EUR\n")
+        write(f"  Liquido:           {doc.total_liquido:>15,.2f} EUR\n")
+        write(f"  A Liquidar:        {doc.a_liquidar:>15,.2f} EUR\n")
 
-        print(f"\n{'-'*100}")
-        print("VALIDATION (Record Sum vs Page 2 Totals)")
-        print(f"{'-'*100}")
+        write(f"\n{'-'*100}\n")
+        write("VALIDATION (Record Sum vs Page 2 Totals)\n")
+        write(f"{'-'*100}\n")
 
         # Compare
         diff_vol = abs(calc_voluntaria - doc.total_voluntaria)
@@ -79,93 +91,75 @@ def validate_extraction(pdf_path: Path):
         diff_rec = abs(calc_recargo - doc.total_recargo)
         diff_liq = abs(calc_liquido - doc.total_liquido)
 
-        print(f"  Voluntaria diff:   {diff_vol:>15,.2f} EUR", end="")
-        if diff_vol < 1:
-            print(" [OK]")
-        elif diff_vol < 100:
-            print(" [WARNING - Small difference]")
-        else:
-            print(" [ERROR - Large difference!]")
-
-        print(f"  Ejecutiva diff:    {diff_eje:>15,.2f} EUR", end="")
-        if diff_eje < 1:
-            print(" [OK]")
-        elif diff_eje < 100:
-            print(" [WARNING - Small difference]")
-        else:
-            print(" [ERROR - Large difference!]")
-
-        print(f"  Recargo diff:      {diff_rec:>15,.2f} EUR", end="")
-        if diff_rec < 1:
-            print(" [OK]")
-        elif diff_rec < 100:
-            print(" [WARNING - Small difference]")
-        else:
-            print(" [ERROR - Large difference!]")
-
-        print(f"  Liquido diff:      {diff_liq:>15,.2f} EUR", end="")
-        if diff_liq < 1:
-            print(" [OK]")
-        elif diff_liq < 100:
-            print(" [WARNING - Small difference]")
-        else:
-            print(" [ERROR - Large difference!]")
+        for label, diff in (
+            ('Voluntaria', diff_vol),
+            ('Ejecutiva', diff_eje),
+            ('Recargo', diff_rec),
+            ('Liquido', diff_liq),
+        ):
+            if diff < 1:
+                status = "[OK]"
+            elif diff < 100:
+                status = "[WARNING - Small difference]"
+            else:
+                status = "[ERROR - Large difference!]"
+            write(f"  {label + ' diff:':<19}{diff:>15,.2f} EUR {status}\n")
 
         # Exercise summaries
         if doc.exercise_summaries:
-            print(f"\n{'-'*100}")
-            print(f"EXERCISE SUMMARIES: {len(doc.exercise_summaries)}")
-            print(f"{'-'*100}")
+            write(f"\n{'-'*100}\n")
+            write(f"EXERCISE SUMMARIES: {len(doc.exercise_summaries)}\n")
+            write(f"{'-'*100}\n")
             for summary in doc.exercise_summaries:
-                print(f"\n  Ejercicio {summary.ejercicio}:")
-                print(f"    Voluntaria: {summary.voluntaria:>12,.2f}")
-                print(f"    Ejecutiva:  {summary.ejecutiva:>12,.2f}")
-                print(f"    Liquido:    {summary.liquido:>12,.2f}")
+                write(f"\n  Ejercicio {summary.ejercicio}:\n")
+                write(f"    Voluntaria: {summary.voluntaria:>12,.2f}\n")
+                write(f"    Ejecutiva:  {summary.ejecutiva:>12,.2f}\n")
+                write(f"    Liquido:    {summary.liquido:>12,.2f}\n")
 
         # Deductions
         if doc.deductions:
-            print(f"\n{'-'*100}")
-            print("DEDUCTIONS")
-            print(f"{'-'*100}")
-            print(f"  Tasa Voluntaria:   {doc.deductions.tasa_voluntaria:>12,.2f}")
-            print(f"  Tasa Ejecutiva:    {doc.deductions.tasa_ejecutiva:>12,.2f}")
-            print(f"  Anticipos:         {doc.deductions.anticipos:>12,.2f}")
+            write(f"\n{'-'*100}\n")
+            write("DEDUCTIONS\n")
+            write(f"{'-'*100}\n")
+            write(f"  Tasa Voluntaria:   {doc.deductions.tasa_voluntaria:>12,.2f}\n")
+            write(f"  Tasa Ejecutiva:    {doc.deductions.tasa_ejecutiva:>12,.2f}\n")
+            write(f"  Anticipos:         {doc.deductions.anticipos:>12,.2f}\n")
 
-        print(f"\n{'='*100}")
-        print("OVERALL STATUS")
-        print(f"{'='*100}\n")
+        write(f"\n{'='*100}\n")
+        write("OVERALL STATUS\n")
+        write(f"{'='*100}\n\n")
 
         max_diff = max(diff_vol, diff_eje, diff_rec, diff_liq)
 
         if max_diff < 1:
-            print("  STATUS: EXCELLENT - Sums match page 2 totals perfectly")
-            print("  Your current extraction is ACCURATE!")
+            write("  STATUS: EXCELLENT - Sums match page 2 totals perfectly\n")
+            write("  Your current extraction is ACCURATE!\n")
         elif max_diff < 100:
-            print("  STATUS: GOOD - Minor differences (likely rounding)")
-            print("  Your current extraction is working well")
+            write("  STATUS: GOOD - Minor differences (likely rounding)\n")
+            write("  Your current extraction is working well\n")
         else:
-            print("  STATUS: NEEDS REVIEW - Significant differences detected")
-            print("  Possible issues:")
-            print("    - Missing records (not extracted)")
-            print("    - Duplicate records (merged cells split incorrectly)")
-            print("    - Exercise summary rows counted as records")
+            write("  STATUS: NEEDS REVIEW - Significant differences detected\n")
+            write("  Possible issues:\n")
+            write("    - Missing records (not extracted)\n")
+            write("    - Duplicate records (merged cells split incorrectly)\n")
+            write("    - Exercise summary rows counted as records\n")
 
         return {
             'pdf': pdf_path.name,
             'record_count': len(doc.tribute_records),
             'max_diff': max_diff,
             'status': 'OK' if max_diff < 100 else 'REVIEW'
-        }
+        }, out.getvalue()
 
     except Exception as e:
-        print(f"ERROR: {e}")
+        write(f"ERROR: {e}\n")
         import traceback
-        traceback.print_exc()
+        traceback.print_exc(file=out)
         return {
             'pdf': pdf_path.name,
             'error': str(e),
             'status': 'ERROR'
-        }
+        }, out.getvalue()
 
 
 def main():
@@ -185,9 +179,9 @@ def main():
     results = []
 
     for pdf_path in pdf_files:
-        result = validate_extraction(pdf_path)
+        result, report = validate_extraction(pdf_path)
         results.append(result)
-        print("\n" * 2)
+        sys.stdout.write(report + "\n" * 3)
 
     # Summary
     print(f"\n{'='*100}")
@@ -2,13 +2,16 @@
 Excel exporter for liquidation documents.
 
 Creates well-formatted Excel workbooks with multiple sheets for different data sections.
+
+Sheets are written with xlsxwriter in ``constant_memory`` mode: each row is
+flushed to disk as soon as the next one starts, so memory stays flat regardless
+of the number of records. Rows must therefore be written top-to-bottom and
+formatted as they are written (there is no post-hoc formatting pass).
 """
-import pandas as pd
 from pathlib import Path
-from typing import List
-from openpyxl import load_workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
+from typing import Any, Dict, List, Sequence
+
+import xlsxwriter
 
 from src.models.liquidation import LiquidationDocument
 
@@ -18,6 +21,7 @@ class ExcelExporter:
 
     def __init__(self, document: LiquidationDocument):
         self.document = document
+        self._formats: Dict[Any, Any] = {}
 
     def export(self, output_path: str):
         """
@@ -28,298 +32,273 @@ class ExcelExporter:
         """
         output_path = Path(output_path)
 
-        # Create Excel writer
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+        # strings_to_urls off: cell text is written as-is, never turned into hyperlinks
+        workbook = xlsxwriter.Workbook(str(output_path), {
+            'constant_memory': True,
+            'strings_to_urls': False
+        })
+        try:
+            self._formats = self._create_formats(workbook)
+
             # Write different sections to different sheets
-            self._write_document_info(writer)
-            self._write_tribute_records(writer)
-            self._write_exercise_summaries(writer)
-            self._write_deductions(writer)
-            self._write_refunds(writer)
+            self._write_document_info(workbook)
+            self._write_tribute_records(workbook)
+            self._write_exercise_summaries(workbook)
+            self._write_deductions(workbook)
+            self._write_refunds(workbook)
+        finally:
+            workbook.close()
+
+    def _create_formats(self, workbook) -> Dict[Any, Any]:
+        """Create the cell formats shared by every sheet."""
+        border = {'border': 1}
+        number = {'num_format': '#,##0.00', 'align': 'right'}
+        total = {'bold': True, 'bg_color': '#D9E1F2'}
+
+        return {
+            'header': workbook.add_format({
+                **border,
+                'bold': True,
+                'font_color': '#FFFFFF',
+                'bg_color': '#366092',
+                'align': 'center',
+                'valign': 'vcenter'
+            }),
+            # Keyed by (is_total_row, is_number)
+            (False, False): workbook.add_format(border),
+            (False, True): workbook.add_format({**border, **number}),
+            (True, False): workbook.add_format({**border, **total}),
+            (True, True): workbook.add_format({**border, **number, **total}),
+        }
 
-        # Apply formatting
-        self._apply_formatting(output_path)
+    def _write_sheet(self, workbook, sheet_name: str, headers: Sequence[str],
+                     rows: List[Sequence[Any]], highlight_total: bool = False):
+        """
+        Write a formatted sheet row by row.
 
-    def _write_document_info(self, writer):
-        """Write document header information."""
-        info_data = {
-            'Campo': [
-                'Ejercicio',
-                'Mandamiento de Pago',
-                'Fecha Mandamiento',
-                'Número de Liquidación',
-                'Código Entidad',
-                'Entidad',
-                'Total Registros',
-                'Total Líquido',
-                'A Liquidar',
-                'Código Verificación',
-                'Firmado Por',
-                'Fecha Firma'
-            ],
-            'Valor': [
-                self.document.ejercicio,
-                self.document.mandamiento_pago,
-                self.document.fecha_mandamiento.strftime('%d/%m/%Y') if self.document.fecha_mandamiento else '',
-                self.document.numero_liquidacion,
-                self.document.codigo_entidad,
-                self.document.entidad,
-                self.document.total_records,
-                float(self.document.total_liquido),
-                float(self.document.a_liquidar),
-                self.document.codigo_verificacion or '',
-                self.document.firmado_por or '',
-                self.document.fecha_firma.strftime('%d/%m/%Y %H:%M:%S') if self.document.fecha_firma else ''
-            ]
-        }
+        Args:
+            workbook: Target xlsxwriter workbook
+            sheet_name: Name of the sheet to create
+            headers: Column headers (first row)
+            rows: Data rows, in column order
+            highlight_total: Highlight rows whose first cell is 'TOTAL'
+        """
+        ws = workbook.add_worksheet(sheet_name)
 
-        df = pd.DataFrame(info_data)
-        df.to_excel(writer, sheet_name='Información', index=False)
+        # Auto-adjust column widths (must be known before rows are flushed)
+        widths = [len(str(header)) for header in headers]
+        for row in rows:
+            for col, value in enumerate(row):
+                widths[col] = max(widths[col], len(str(value)))
+        for col, width in enumerate(widths):
+            ws.set_column(col, col, min(width + 2, 50))
 
-    def _write_tribute_records(self, writer):
+        ws.write_row(0, 0, headers, self._formats['header'])
+
+        for row_idx, row in enumerate(rows, start=1):
+            is_total = highlight_total and row[0] == 'TOTAL'
+            for col, value in enumerate(row):
+                is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+                ws.write(row_idx, col, value, self._formats[(is_total, is_number)])
+
+        # Freeze first row
+        ws.freeze_panes(1, 0)
+
+    def _write_document_info(self, workbook):
+        """Write document header information."""
+        campos = [
+            'Ejercicio',
+            'Mandamiento de Pago',
+            'Fecha Mandamiento',
+            'Número de Liquidación',
+            'Código Entidad',
+            'Entidad',
+            'Total Registros',
+            'Total Líquido',
+            'A Liquidar',
+            'Código Verificación',
+            'Firmado Por',
+            'Fecha Firma'
+        ]
+        valores = [
+            self.document.ejercicio,
+            self.document.mandamiento_pago,
+            self.document.fecha_mandamiento.strftime('%d/%m/%Y') if self.document.fecha_mandamiento else '',
+            self.document.numero_liquidacion,
+            self.document.codigo_entidad,
+            self.document.entidad,
+            self.document.total_records,
+            float(self.document.total_liquido),
+            float(self.document.a_liquidar),
+            self.document.codigo_verificacion or '',
+            self.document.firmado_por or '',
+            self.document.fecha_firma.strftime('%d/%m/%Y %H:%M:%S') if self.document.fecha_firma else ''
+        ]
+
+        self._write_sheet(workbook, 'Información', ['Campo', 'Valor'], list(zip(campos, valores)))
+
+    def _write_tribute_records(self, workbook):
         """Write tribute records (cobros) table."""
+        headers = [
+            'Ejercicio', 'Concepto', 'Clave Contabilidad', 'Clave Recaudación',
+            'Voluntaria', 'Ejecutiva', 'Recargo', 'Diputación Voluntaria',
+            'Diputación Ejecutiva', 'Diputación Recargo', 'Líquido'
+        ]
         records_data = []
 
         for record in self.document.tribute_records:
-            records_data.append({
-                'Ejercicio': record.ejercicio,
-                'Concepto': record.concepto,
-                'Clave Contabilidad': record.clave_contabilidad,
-                'Clave Recaudación': record.clave_recaudacion,
-                'Voluntaria': float(record.voluntaria),
-                'Ejecutiva': float(record.ejecutiva),
-                'Recargo': float(record.recargo),
-                'Diputación Voluntaria': float(record.diputacion_voluntaria),
-                'Diputación Ejecutiva': float(record.diputacion_ejecutiva),
-                'Diputación Recargo': float(record.diputacion_recargo),
-                'Líquido': float(record.liquido)
-            })
-
-        df = pd.DataFrame(records_data)
-        df.to_excel(writer, sheet_name='Registros de Cobros', index=False)
-
-    def _write_exercise_summaries(self, writer):
+            records_data.append((
+                record.ejercicio,
+                record.concepto,
+                record.clave_contabilidad,
+                record.clave_recaudacion,
+                float(record.voluntaria),
+                float(record.ejecutiva),
+                float(record.recargo),
+                float(record.diputacion_voluntaria),
+                float(record.diputacion_ejecutiva),
+                float(record.diputacion_recargo),
+                float(record.liquido)
+            ))
+
+        self._write_sheet(workbook, 'Registros de Cobros', headers, records_data)
+
+    def _write_exercise_summaries(self, workbook):
         """Write exercise summaries."""
+        headers = [
+            'Ejercicio', 'Voluntaria', 'Ejecutiva', 'Recargo', 'Diputación Voluntaria',
+            'Diputación Ejecutiva', 'Diputación Recargo', 'Líquido', 'Número de Registros'
+        ]
         summaries_data = []
 
         for summary in self.document.exercise_summaries:
-            summaries_data.append({
-                'Ejercicio': summary.ejercicio,
-                'Voluntaria': float(summary.voluntaria),
-                'Ejecutiva': float(summary.ejecutiva),
-                'Recargo': float(summary.recargo),
-                'Diputación Voluntaria': float(summary.diputacion_voluntaria),
-                'Diputación Ejecutiva': float(summary.diputacion_ejecutiva),
-                'Diputación Recargo': float(summary.diputacion_recargo),
-                'Líquido': float(summary.liquido),
-                'Número de Registros': len(summary.records)
-            })
+            summaries_data.append((
+                summary.ejercicio,
+                float(summary.voluntaria),
+                float(summary.ejecutiva),
+                float(summary.recargo),
+                float(summary.diputacion_voluntaria),
+                float(summary.diputacion_ejecutiva),
+                float(summary.diputacion_recargo),
+                float(summary.liquido),
+                len(summary.records)
+            ))
 
         # Add overall totals
-        summaries_data.append({
-            'Ejercicio': 'TOTAL',
-            'Voluntaria': float(self.document.total_voluntaria),
-            'Ejecutiva': float(self.document.total_ejecutiva),
-            'Recargo': float(self.document.total_recargo),
-            'Diputación Voluntaria': float(self.document.total_diputacion_voluntaria),
-            'Diputación Ejecutiva': float(self.document.total_diputacion_ejecutiva),
-            'Diputación Recargo': float(self.document.total_diputacion_recargo),
-            'Líquido': float(self.document.total_liquido),
-            'Número de Registros': self.document.total_records
-        })
-
-        df = pd.DataFrame(summaries_data)
-        df.to_excel(writer, sheet_name='Resumen por Ejercicio', index=False)
-
-    def _write_deductions(self, writer):
+        summaries_data.append((
+            'TOTAL',
+            float(self.document.total_voluntaria),
+            float(self.document.total_ejecutiva),
+            float(self.document.total_recargo),
+            float(self.document.total_diputacion_voluntaria),
+            float(self.document.total_diputacion_ejecutiva),
+            float(self.document.total_diputacion_recargo),
+            float(self.document.total_liquido),
+            self.document.total_records
+        ))
+
+        # Highlight total rows in "Resumen por Ejercicio"
+        self._write_sheet(workbook, 'Resumen por Ejercicio', headers, summaries_data,
+                          highlight_total=True)
+
+    def _write_deductions(self, workbook):
         """Write deductions and advance breakdown."""
         if not self.document.deductions:
             return
 
         ded = self.document.deductions
 
-        deductions_data = {
-            'Categoría': [
-                'RECAUDACIÓN',
-                'Tasa Voluntaria',
-                'Tasa Ejecutiva',
-                'Tasa Ejecutiva Sin Recargo',
-                'Tasa Baja Órgano Gestor Deleg.',
-                '',
-                'TRIBUTARIA',
-                'Tasa Gestión Tributaria',
-                'Tasa Gestión Censal',
-                'Tasa Gestión Catastral',
-                '',
-                'MULTAS/SANCIONES',
-                'Tasa Sanción Tributaria',
-                'Tasa Sanción Recaudación',
-                'Tasa Sanción Inspección',
-                'Tasa Multas de Tráfico',
-                '',
-                'OTRAS DEDUCCIONES',
-                'Gastos Repercutidos',
-                'Anticipos',
-                'Intereses por Anticipo',
-                'Expedientes Compensación',
-                'Expedientes Ingresos Indebidos',
-                '',
-                'TOTAL DEDUCCIONES'
-            ],
-            'Importe': [
-                '',
-                float(ded.tasa_voluntaria),
-                float(ded.tasa_ejecutiva),
-                float(ded.tasa_ejecutiva_sin_recargo),
-                float(ded.tasa_baja_organo_gestor_deleg),
-                '',
-                '',
-                float(ded.tasa_gestion_tributaria),
-                float(ded.tasa_gestion_censal),
-                float(ded.tasa_gestion_catastral),
-                '',
-                '',
-                float(ded.tasa_sancion_tributaria),
-                float(ded.tasa_sancion_recaudacion),
-                float(ded.tasa_sancion_inspeccion),
-                float(ded.tasa_multas_trafico),
-                '',
-                '',
-                float(ded.gastos_repercutidos),
-                float(ded.anticipos),
-                float(ded.intereses_por_anticipo),
-                float(ded.expedientes_compensacion),
-                float(ded.expedientes_ingresos_indebidos),
-                '',
-                float(ded.total_deducciones)
-            ]
-        }
-
-        df = pd.DataFrame(deductions_data)
-        df.to_excel(writer, sheet_name='Deducciones', index=False)
+        deductions_data = [
+            ('RECAUDACIÓN', ''),
+            ('Tasa Voluntaria', float(ded.tasa_voluntaria)),
+            ('Tasa Ejecutiva', float(ded.tasa_ejecutiva)),
+            ('Tasa Ejecutiva Sin Recargo', float(ded.tasa_ejecutiva_sin_recargo)),
+            ('Tasa Baja Órgano Gestor Deleg.', float(ded.tasa_baja_organo_gestor_deleg)),
+            ('', ''),
+            ('TRIBUTARIA', ''),
+            ('Tasa Gestión Tributaria', float(ded.tasa_gestion_tributaria)),
+            ('Tasa Gestión Censal', float(ded.tasa_gestion_censal)),
+            ('Tasa Gestión Catastral', float(ded.tasa_gestion_catastral)),
+            ('', ''),
+            ('MULTAS/SANCIONES', ''),
+            ('Tasa Sanción Tributaria', float(ded.tasa_sancion_tributaria)),
+            ('Tasa Sanción Recaudación', float(ded.tasa_sancion_recaudacion)),
+            ('Tasa Sanción Inspección', float(ded.tasa_sancion_inspeccion)),
+            ('Tasa Multas de Tráfico', float(ded.tasa_multas_trafico)),
+            ('', ''),
+            ('OTRAS DEDUCCIONES', ''),
+            ('Gastos Repercutidos', float(ded.gastos_repercutidos)),
+            ('Anticipos', float(ded.anticipos)),
+            ('Intereses por Anticipo', float(ded.intereses_por_anticipo)),
+            ('Expedientes Compensación', float(ded.expedientes_compensacion)),
+            ('Expedientes Ingresos Indebidos', float(ded.expedientes_ingresos_indebidos)),
+            ('', ''),
+            ('TOTAL DEDUCCIONES', float(ded.total_deducciones))
+        ]
+
+        self._write_sheet(workbook, 'Deducciones', ['Categoría', 'Importe'], deductions_data)
 
         # Write advance breakdown if available
         if self.document.advance_breakdown:
+            headers = [
+                'Ejercicio', 'Urbana', 'Rústica', 'Vehículos', 'BICE',
+                'IAE', 'Tasas', 'Ejecutiva', 'Total'
+            ]
             advance_data = []
             for adv in self.document.advance_breakdown:
-                advance_data.append({
-                    'Ejercicio': adv.ejercicio,
-                    'Urbana': float(adv.urbana),
-                    'Rústica': float(adv.rustica),
-                    'Vehículos': float(adv.vehiculos),
-                    'BICE': float(adv.bice),
-                    'IAE': float(adv.iae),
-                    'Tasas': float(adv.tasas),
-                    'Ejecutiva': float(adv.ejecutiva),
-                    'Total': float(adv.total)
-                })
-
-            df_advance = pd.DataFrame(advance_data)
-            df_advance.to_excel(writer, sheet_name='Anticipos', index=False)
-
-    def _write_refunds(self, writer):
+                advance_data.append((
+                    adv.ejercicio,
+                    float(adv.urbana),
+                    float(adv.rustica),
+                    float(adv.vehiculos),
+                    float(adv.bice),
+                    float(adv.iae),
+                    float(adv.tasas),
+                    float(adv.ejecutiva),
+                    float(adv.total)
+                ))
+
+            self._write_sheet(workbook, 'Anticipos', headers, advance_data)
+
+    def _write_refunds(self, workbook):
         """Write refund records."""
         if not self.document.refund_records:
             return
 
+        headers = [
+            'Nº Expediente', 'Nº Resolución', 'Nº Solicitud', 'Total Devolución',
+            'Entidad', 'Diputación', 'Intereses', 'Comp. Trib.', 'A Deducir'
+        ]
         refunds_data = []
         for refund in self.document.refund_records:
-            refunds_data.append({
-                'Nº Expediente': refund.num_expte,
-                'Nº Resolución': refund.num_resolucion,
-                'Nº Solicitud': refund.num_solic,
-                'Total Devolución': float(refund.total_devolucion),
-                'Entidad': float(refund.entidad),
-                'Diputación': float(refund.diputacion),
-                'Intereses': float(refund.intereses),
-                'Comp. Trib.': float(refund.comp_trib),
-                'A Deducir': float(refund.a_deducir)
-            })
-
-        df = pd.DataFrame(refunds_data)
-        df.to_excel(writer, sheet_name='Devoluciones', index=False)
+            refunds_data.append((
+                refund.num_expte,
+                refund.num_resolucion,
+                refund.num_solic,
+                float(refund.total_devolucion),
+                float(refund.entidad),
+                float(refund.diputacion),
+                float(refund.intereses),
+                float(refund.comp_trib),
+                float(refund.a_deducir)
+            ))
+
+        self._write_sheet(workbook, 'Devoluciones', headers, refunds_data)
 
         # Write summaries if available
         if self.document.refund_summaries:
+            headers = ['Concepto', 'Total Devolución', 'Entidad', 'Diputación', 'Intereses']
             summaries_data = []
             for summary in self.document.refund_summaries:
-                summaries_data.append({
-                    'Concepto': summary.concepto,
-                    'Total Devolución': float(summary.total_devolucion),
-                    'Entidad': float(summary.entidad),
-                    'Diputación': float(summary.diputacion),
-                    'Intereses': float(summary.intereses)
-                })
-
-            df_summary = pd.DataFrame(summaries_data)
-            df_summary.to_excel(writer, sheet_name='Resumen Devoluciones', index=False)
-
-    def _apply_formatting(self, file_path: Path):
-        """Apply formatting to the Excel workbook."""
-        wb = load_workbook(file_path)
-
-        # Define styles
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        total_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-        total_font = Font(bold=True, size=11)
-
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-
-        # Format each sheet
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-
-            # Format header row
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = border
-
-            # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column_letter = get_column_letter(column[0].column)
-
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
-
-            # Format number columns
-            for row in ws.iter_rows(min_row=2):
-                for cell in row:
-                    # Apply border to all cells
-                    cell.border = border
-
-                    # Format numbers
-                    if isinstance(cell.value, (int, float)) and not isinstance(cell.value, bool):
-                        cell.number_format = '#,##0.00'
-                        cell.alignment = Alignment(horizontal='right')
-
-            # Highlight total rows in "Resumen por Ejercicio"
-            if sheet_name == 'Resumen por Ejercicio':
-                for row in ws.iter_rows(min_row=2):
-                    if row[0].value == 'TOTAL':
-                        for cell in row:
-                            cell.fill = total_fill
-                            cell.font = total_font
-
-            # Freeze first row
-            ws.freeze_panes = ws['A2']
-
-        wb.save(file_path)
+                summaries_data.append((
+                    summary.concepto,
+                    float(summary.total_devolucion),
+                    float(summary.entidad),
+                    float(summary.diputacion),
+                    float(summary.intereses)
+                ))
+
+            self._write_sheet(workbook, 'Resumen Devoluciones', headers, summaries_data)
 
 
 def export_to_excel(document: LiquidationDocument, output_path: str):
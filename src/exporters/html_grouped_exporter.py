@@ -1,400 +1,93 @@
 """
 HTML Exporter for Grouped Concept Records
 Exports liquidation data grouped by concept to a standalone HTML page
+
+The page is streamed: every fragment goes straight to a write callable
+(the buffered output file). Keep it that way when extending the exporter -
+do not accumulate HTML with `+=` on a string or on a `self.` attribute,
+which is quadratic on PyPy and defeats CPython's in-place concatenation.
 """
 
-from typing import List, Dict, Tuple, Set
+import gzip
+import os
+import sys
+from typing import Any, Callable, List, Dict, NamedTuple, TextIO, Tuple, Set
 from decimal import Decimal
 from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
+from html import escape
+from itertools import groupby
+from operator import attrgetter
 
 from ..models.liquidation import LiquidationDocument, TributeRecord
 from ..models.grouping_config import GroupingConfig
 
 
-class HTMLGroupedExporter:
-    """Exports grouped concept records to HTML format"""
-
-    # Mapping of OPAEF concept codes to local contable partidas
-    CORRESP_PARTIDAS = {
-        '751': ['300', 'agua'],  # consumo agua
-        '678': ['300', 'agua'],  # agua alta contador
-        '450': ['300', 'agua'],  # agua consumo
-        '451': ['10049', 'agua'],  # iva agua?
-        '452': ['300', 'agua'],  # agua canon ayto
-        '750': ['300', 'agua'],  # agua cuota fija
-        '568': ['305', 'agua'],  # agua canon junta andalucía
-        '573': ['10049', 'agua'],  # agua iva cuota fija
-        '665': ['10049', 'agua'],  # agua iva agua
-        '752': ['10049', 'agua'],  # agua iva
-        '753': ['10049', 'agua'],  # agua iva conservacion
-        '015': ['116', 'plusvalia'],  # plusvalia ivtnu
-        '022': ['302', 'basuras'],  # basuras
-        '025': ['331', 'cocheras'],  # entr. vehículos
-        '033': ['325', 'exp. doc.'],  # licencia apertura
-        '520': ['325', 'exp. doc.'],  # licencia apertura2
-        '039': ['32903', 'mercado'],  # mercado
-        '062': ['339', 'dom. publico'],  # ocup. via pública
-        '640': ['339', 'dom. publico'],  # tasas ocup dom publico (barraca feria)
-        '649': ['339', 'dom. publico'],  # tasas ocup dom publico (andamios/esco)
-        '663': ['339', 'dom. publico'],  # tasas ocup dom publico (escombros)
-        '329': ['331', 'cocheras'],  # reserva aparcamiento
-        '008': ['32900', 'cementerio'],  # TASAS CEMENTERIO INHUMACION
-        '035': ['32900', 'cementerio'],  # serv. cementerio
-        '372': ['32904', 'guarderia'],  # guardería
-        '398': ['32904', 'guarderia'],  # guardería comedor
-        '516': ['32904', 'guarderia'],  # taller absentismo
-        '806': ['332', 'topv'],  # topv vuelo, suelo, sub, emp suministradoras
-        '462': ['39120', 'multas ant'],  # multas trafico antiguas
-        '512': ['290', 'obras'],  # impuesto de constr, instalaciones y obras
-        '699': ['290', 'obras'],  # prestacion compensatoria ley ou
-        '669': ['399', '399 otros_i'],  # daños via publica
-        # GESTION OPAEF
-        '102': ['114', 'ibi esp'],  # IBI INMEBLES ESPECIALES
-        '204': ['130', 'iae'],  # iae
-        '206': ['130', 'iae'],  # altas iae
-        '205': ['112', 'ibi rus'],  # ibi rústica
-        '208': ['113', 'ibi urb'],  # ibi urbana
-        '213': ['130', 'iae inspeccion'],  # iae inspeccion
-        '218': ['39110', 'multas por infracc trib'],  # multas por infracciones tributarias
-        '501': ['115', 'ivtm'],  # ivtm
-        '700': ['393', 'intereses'],  # intereses de demora
-        '777': ['39120', 'multas'],  # multas tráfico
-    }
-
-    def __init__(self, document: LiquidationDocument, grouping_config: GroupingConfig):
-        """
-        Initialize the HTML exporter
-
-        Args:
-            document: LiquidationDocument with all records
-            grouping_config: GroupingConfig with concept and custom group definitions
-        """
-        self.document = document
-        self.grouping_config = grouping_config
-
-    def _compact_codes(self, codes: List[str]) -> str:
-        """
-        Compact a list of codes by grouping common patterns.
-
-        Examples:
-            026/2021/58/064/573, 026/2021/58/064/665, ...
-            -> 026/2021/58/{064,068,086}/573,665,752,753
-
-            2023/E/0000783, 2023/E/0000784, ...
-            -> 2023/E/783,784,786,787
-
-        Args:
-            codes: List of code strings to compact
-
-        Returns:
-            Compacted string representation
-        """
-        if not codes:
-            return ""
-
-        # Group codes by pattern
-        five_part = defaultdict(lambda: defaultdict(set))  # {(base): {level: {suffixes}}}
-        e_codes = []
-        otros = []
-
-        for c in codes:
-            parts = c.split('/')
-            if len(parts) == 5:
-                # Format: 026/2021/58/064/573
-                base = tuple(parts[:3])  # (026, 2021, 58)
-                level = parts[3]  # 064
-                suffix = parts[4]  # 573
-                five_part[base][level].add(suffix)
-            elif len(parts) == 3 and parts[1] == 'E':
-                # Format: 2023/E/0000783
-                # Remove leading zeros from number
-                num = parts[2].lstrip('0') or '0'
-                e_codes.append(num)
-            else:
-                # Unknown format, keep as-is
-                otros.append(c)
-
-        result = []
-
-        # Format five-part codes
-        for base, levels_dict in sorted(five_part.items()):
-            levels = sorted(levels_dict.keys())
-            # Get all unique suffixes across all levels
-            all_suffixes = set()
-            for suffixes in levels_dict.values():
-                all_suffixes.update(suffixes)
-            suffixes_str = ','.join(sorted(all_suffixes))
-
-            # Format: 026/2021/58/{064,068,086}/573,665,752,753
-            base_str = '/'.join(base)
-            levels_str = '{' + ','.join(levels) + '}'
-            result.append(f"{base_str}/{levels_str}/{suffixes_str}")
-
-        # Format E-codes (sort numerically)
-        if e_codes:
-            # Sort numerically
-            sorted_e = sorted(e_codes, key=lambda x: int(x) if x.isdigit() else 0)
-            result.append(f"2023/E/{','.join(sorted_e)}")
-
-        # Add other codes as-is
-        result.extend(otros)
-
-        return ' '.join(result)
-
-    def _get_partidas_from_records(self, records: List[TributeRecord]) -> str:
-        """
-        Extract unique partidas from records and format them.
-
-        Args:
-            records: List of tribute records
-
-        Returns:
-            Formatted string with partidas, e.g., "300, 10049"
-        """
-        partidas_set = set()
-
-        for record in records:
-            # Extract concept code from clave_recaudacion
-            concept_code = self.grouping_config.get_concept_code(record.clave_recaudacion)
-
-            # Look up partida in the mapping
-            if concept_code in self.CORRESP_PARTIDAS:
-                partida = self.CORRESP_PARTIDAS[concept_code][0]
-                partidas_set.add(partida)
-
-        # Return sorted unique partidas as comma-separated string
-        if partidas_set:
-            return ', '.join(sorted(partidas_set))
-        else:
-            # If no partidas found, return a default value
-            return 'N/A'
-
-    def export_grouped_concepts(
-        self,
-        output_path: str,
-        group_by_year: bool = True,
-        group_by_concept: bool = True,
-        group_by_custom: bool = False
-    ) -> None:
-        """
-        Export grouped concept records to HTML
-
-        Args:
-            output_path: Path where to save the HTML file
-            group_by_year: Whether to group by year
-            group_by_concept: Whether to group by concept
-            group_by_custom: Whether to apply custom grouping
-        """
-        # Organize data according to grouping settings
-        grouped_data = self._organize_data(group_by_year, group_by_concept, group_by_custom)
-
-        # Generate HTML content
-        html_content = self._generate_html(grouped_data, group_by_year, group_by_concept, group_by_custom)
-
-        # Write to file
-        output_file = Path(output_path)
-        output_file.write_text(html_content, encoding='utf-8')
-
-    def _organize_data(
-        self,
-        group_by_year: bool,
-        group_by_concept: bool,
-        group_by_custom: bool
-    ) -> Dict:
-        """
-        Organize records according to grouping configuration
-
-        Returns:
-            Dictionary with organized data structure
-        """
-        if group_by_year:
-            # Group by year first
-            years_data = {}
-            for year in sorted(set(r.ejercicio for r in self.document.tribute_records)):
-                year_records = [r for r in self.document.tribute_records if r.ejercicio == year]
-                years_data[year] = self._organize_records(year_records, group_by_concept, group_by_custom)
-            return years_data
-        else:
-            # All records together
-            return {None: self._organize_records(self.document.tribute_records, group_by_concept, group_by_custom)}
-
-    def _organize_records(
-        self,
-        records: List[TributeRecord],
-        group_by_concept: bool,
-        group_by_custom: bool
-    ) -> List[Dict]:
-        """
-        Organize a list of records into groups
+# Buffer size for streaming the export to disk. Large enough that a typical
+# report is written in a handful of syscalls while keeping memory bounded
+_WRITE_BUFFER_SIZE = 1 << 17  # 128 KiB
 
-        Returns:
-            List of group dictionaries with name, records, and totals
-        """
-        if not group_by_concept and not group_by_custom:
-            # Return all records as one group
-            return [{
-                'name': 'Todos los conceptos',
-                'records': records,
-                'liquido': sum(r.liquido for r in records)
-            }]
+# Single-pass escaping of text embedded in JavaScript string literals
+_JS_ESCAPE = str.maketrans({"'": "\\'", '"': '\\"', '\n': '\\n', '\r': '\\r'})
 
-        groups = []
+# Swaps thousands and decimal separators to the Spanish convention (1.234,56)
+_ES_NUMBER = str.maketrans({',': '.', '.': ','})
 
-        if group_by_concept and not group_by_custom:
-            # Group by concept only
-            concept_groups = {}
-            for record in records:
-                concept_code = self.grouping_config.get_concept_code(record.clave_recaudacion)
-                concept_name = self.grouping_config.concept_names.get(concept_code, concept_code)
-
-                if concept_name not in concept_groups:
-                    concept_groups[concept_name] = []
-                concept_groups[concept_name].append(record)
-
-            for concept_name, concept_records in sorted(concept_groups.items()):
-                groups.append({
-                    'name': concept_name,
-                    'records': concept_records,
-                    'liquido': sum(r.liquido for r in concept_records)
-                })
+def _minify_html_static(html: str) -> str:
+    """
+    Conservatively shrink a static HTML fragment
 
-        elif group_by_custom:
-            # Apply custom grouping
-            if group_by_concept:
-                # First group by concept, then apply custom groups
-                concept_groups = {}
-                for record in records:
-                    concept_code = self.grouping_config.get_concept_code(record.clave_recaudacion)
-                    if concept_code not in concept_groups:
-                        concept_groups[concept_code] = []
-                    concept_groups[concept_code].append(record)
-
-                # Apply custom groups to concepts
-                used_concepts = set()
-                for custom_group in self.grouping_config.custom_groups:
-                    group_records = []
-                    for concept_code in custom_group.concept_codes:
-                        if concept_code in concept_groups:
-                            group_records.extend(concept_groups[concept_code])
-                            used_concepts.add(concept_code)
+    Strips indentation and trailing whitespace and drops blank lines and
+    whole-line CSS comments. Lines inside <script> are kept verbatim so
+    JavaScript semantics (automatic semicolon insertion) are untouched.
 
-                    if group_records:
-                        groups.append({
-                            'name': custom_group.name,
-                            'records': group_records,
-                            'liquido': sum(r.liquido for r in group_records)
-                        })
+    Args:
+        html: HTML source
 
-                # Add ungrouped concepts
-                for concept_code, concept_records in sorted(concept_groups.items()):
-                    if concept_code not in used_concepts:
-                        concept_name = self.grouping_config.concept_names.get(concept_code, concept_code)
-                        groups.append({
-                            'name': concept_name,
-                            'records': concept_records,
-                            'liquido': sum(r.liquido for r in concept_records)
-                        })
+    Returns:
+        Minified HTML ending with a newline
+    """
+    lines = []
+    in_script = False
+    for line in html.splitlines():
+        stripped = line.strip()
+        if in_script:
+            if stripped.startswith('</script>'):
+                in_script = False
+                lines.append(stripped)
             else:
-                # Apply custom groups directly to records
-                used_records = set()
-                for custom_group in self.grouping_config.custom_groups:
-                    group_records = []
-                    for record in records:
-                        concept_code = self.grouping_config.get_concept_code(record.clave_recaudacion)
-                        if concept_code in custom_group.concept_codes:
-                            group_records.append(record)
-                            used_records.add(id(record))
-
-                    if group_records:
-                        groups.append({
-                            'name': custom_group.name,
-                            'records': group_records,
-                            'liquido': sum(r.liquido for r in group_records)
-                        })
-
-                # Add ungrouped records
-                ungrouped_records = [r for r in records if id(r) not in used_records]
-                if ungrouped_records:
-                    groups.append({
-                        'name': 'Sin agrupar',
-                        'records': ungrouped_records,
-                        'liquido': sum(r.liquido for r in ungrouped_records)
-                    })
-
-        return groups
-
-    def _collect_unique_claves(self, records: List[TributeRecord]) -> Tuple[str, str]:
-        """
-        Collect unique clave_recaudacion and clave_contabilidad from records
-        and compact them using the _compact_codes method.
-
-        Returns:
-            Tuple of (claves_recaudacion_str, claves_contabilidad_str)
-        """
-        claves_recaudacion = sorted(set(r.clave_recaudacion for r in records))
-        claves_contabilidad = sorted(set(r.clave_contabilidad for r in records))
-
-        # Compact the codes
-        compacted_recaudacion = self._compact_codes(claves_recaudacion)
-        compacted_contabilidad = self._compact_codes(claves_contabilidad)
-
-        return compacted_recaudacion, compacted_contabilidad
-
-    def _build_texto_sical(self, ejercicio: int, group_name: str, records: List[TributeRecord]) -> str:
-        """
-        Build the texto SICAL string for a group
-
-        Format: OPAEF. REGULARIZACION COBROS {ejercicio} - {nombre_grupo} LIQ. {num} MTO. PAGO {mto} {claves_rec} {claves_cont}
-
-        Args:
-            ejercicio: Fiscal year
-            group_name: Name of the group
-            records: List of tribute records for this group
+                lines.append(line)
+            continue
 
-        Returns:
-            Formatted texto SICAL string
-        """
-        claves_rec, claves_cont = self._collect_unique_claves(records)
+        if not stripped or (stripped.startswith('/*') and stripped.endswith('*/')):
+            continue
+        lines.append(stripped)
+        if stripped.startswith('<script') and '</script>' not in stripped:
+            in_script = True
 
-        # Build the texto with ejercicio and group name
-        return (
-            f"OPAEF. REGULARIZACION COBROS {ejercicio} - {group_name} "
-            f"LIQ. {self.document.numero_liquidacion} "
-            f"MTO. PAGO {self.document.mandamiento_pago} {claves_rec} {claves_cont}"
-        )
+    return '\n'.join(lines) + '\n'
 
-    def _format_decimal(self, value: Decimal) -> str:
-        """Format decimal value as currency string"""
-        return f"{value:,.2f} €".replace(',', 'X').replace('.', ',').replace('X', '.')
 
-    def _generate_html(
-        self,
-        grouped_data: Dict,
-        group_by_year: bool,
-        group_by_concept: bool,
-        group_by_custom: bool
-    ) -> str:
-        """Generate complete HTML document"""
+def _single_line(html: str) -> str:
+    """
+    Collapse a per-row HTML template onto a single line
 
-        # Build the HTML content
-        html_parts = [
-            self._html_header(),
-            self._html_document_info(),
-        ]
+    Drops the indentation and line breaks between tags, so every row costs
+    a handful of bytes instead of a few hundred of whitespace. Inline
+    elements that must keep a space between them go on the same source line.
 
-        # Generate tables for each year (or single table if not grouped by year)
-        for year, groups in grouped_data.items():
-            html_parts.append(self._html_year_table(year, groups))
+    Args:
+        html: HTML template source
 
-        html_parts.append(self._html_footer())
+    Returns:
+        Template on one line, ending with a newline
+    """
+    return ''.join(line.strip() for line in html.splitlines()) + '\n'
 
-        return '\n'.join(html_parts)
 
-    def _html_header(self) -> str:
-        """Generate HTML header with CSS and JavaScript"""
-        return '''<!DOCTYPE html>
+# Static parts of the page, built once at import rather than on every export
+_HEADER_HTML_RAW = '''<!DOCTYPE html>
 <html lang="es">
 <head>
     <meta charset="UTF-8">
@@ -532,9 +225,9 @@ class HTMLGroupedExporter:
             background-color: white;
         }
 
-        .group-separator {
-            height: 20px;
-            background-color: #f5f5f5;
+        /* Gap between groups, drawn on the first row of every group but the first */
+        .year-table tr.group-start:not(:first-child) td {
+            border-top: 20px solid #f5f5f5;
         }
 
         .footer-row {
@@ -695,12 +388,6 @@ class HTMLGroupedExporter:
                 print-color-adjust: exact;
             }
 
-            .group-separator {
-                background-color: #f5f5f5 !important;
-                -webkit-print-color-adjust: exact;
-                print-color-adjust: exact;
-            }
-
             /* Repeat document info on each page */
             .doc-info {
                 display: block;
@@ -775,77 +462,39 @@ class HTMLGroupedExporter:
 </head>
 <body>
     <div class="container">
-'''
-
-    def _html_document_info(self) -> str:
-        """Generate document information section"""
-        fecha_str = self.document.fecha_mandamiento.strftime('%d/%m/%Y') if self.document.fecha_mandamiento else 'N/A'
-
-        return f'''
-        <div class="header">
-            <h1>Liquidación OPAEF - Agrupación por Conceptos</h1>
-            <button class="print-btn" onclick="printReport()">🖨️ Imprimir</button>
-        </div>
 
-        <div class="doc-info">
-            <div class="doc-info-item">
-                <div class="doc-info-label">Entidad</div>
-                <div class="doc-info-value">{self.document.entidad} ({self.document.codigo_entidad})</div>
-            </div>
-            <div class="doc-info-item">
-                <div class="doc-info-label">Nº Liquidación</div>
-                <div class="doc-info-value">{self.document.numero_liquidacion}</div>
-            </div>
-            <div class="doc-info-item">
-                <div class="doc-info-label">Mandamiento de Pago</div>
-                <div class="doc-info-value">{self.document.mandamiento_pago}</div>
-            </div>
-            <div class="doc-info-item">
-                <div class="doc-info-label">Fecha Mandamiento</div>
-                <div class="doc-info-value">{fecha_str}</div>
-            </div>
-            <div class="doc-info-item">
-                <div class="doc-info-label">Ejercicio</div>
-                <div class="doc-info-value">{self.document.ejercicio}</div>
-            </div>
-            <div class="doc-info-item">
-                <div class="doc-info-label">Fecha Exportación</div>
-                <div class="doc-info-value">{datetime.now().strftime('%d/%m/%Y %H:%M')}</div>
-            </div>
-        </div>
 '''
 
-    def _html_year_table(self, year: int, groups: List[Dict]) -> str:
-        """Generate HTML table for a year's groups"""
-        year_label = f"Ejercicio {year}" if year else "Todos los ejercicios"
+_HEADER_HTML = _minify_html_static(_HEADER_HTML_RAW)
 
-        # Calculate total for footer
-        total_liquido = sum(g['liquido'] for g in groups)
+_FOOTER_HTML = '''
+    </div>
+</body>
+</html>
+'''
 
-        # Format document info for print header
-        fecha_str = self.document.fecha_mandamiento.strftime('%d/%m/%Y') if self.document.fecha_mandamiento else 'N/A'
-        fecha_export_str = datetime.now().strftime('%d/%m/%Y %H:%M')
 
-        html_parts = [f'''
+# Opening of each year section: print-only document header and table head
+_YEAR_HEADER_TEMPLATE = _single_line('''
         <div class="year-section">
             <div class="print-year-header">
                 <h2>Liquidación OPAEF - Agrupación por Conceptos</h2>
                 <div class="print-doc-grid">
                     <div class="print-doc-item">
                         <div class="print-doc-label">Entidad</div>
-                        <div class="print-doc-value">{self.document.entidad} ({self.document.codigo_entidad})</div>
+                        <div class="print-doc-value">{entidad} ({codigo_entidad})</div>
                     </div>
                     <div class="print-doc-item">
                         <div class="print-doc-label">Nº Liquidación</div>
-                        <div class="print-doc-value">{self.document.numero_liquidacion}</div>
+                        <div class="print-doc-value">{numero_liquidacion}</div>
                     </div>
                     <div class="print-doc-item">
                         <div class="print-doc-label">Mandamiento de Pago</div>
-                        <div class="print-doc-value">{self.document.mandamiento_pago}</div>
+                        <div class="print-doc-value">{mandamiento_pago}</div>
                     </div>
                     <div class="print-doc-item">
                         <div class="print-doc-label">Fecha Mandamiento</div>
-                        <div class="print-doc-value">{fecha_str}</div>
+                        <div class="print-doc-value">{fecha_mandamiento}</div>
                     </div>
                     <div class="print-doc-item">
                         <div class="print-doc-label">Ejercicio</div>
@@ -853,7 +502,7 @@ class HTMLGroupedExporter:
                     </div>
                     <div class="print-doc-item">
                         <div class="print-doc-label">Fecha Exportación</div>
-                        <div class="print-doc-value">{fecha_export_str}</div>
+                        <div class="print-doc-value">{fecha_export}</div>
                     </div>
                 </div>
             </div>
@@ -864,72 +513,738 @@ class HTMLGroupedExporter:
                     </tr>
                 </thead>
                 <tbody>
-''']
-
-        # Generate rows for each group
-        for idx, group in enumerate(groups):
-            group_id = f"group_{year}_{idx}"
-            # Use the year if available, otherwise use the document's ejercicio
-            ejercicio = year if year is not None else self.document.ejercicio
-            texto_sical = self._build_texto_sical(ejercicio, group['name'], group['records'])
-            liquido_formatted = self._format_decimal(group['liquido'])
-            # Get partidas for this group
-            partidas = self._get_partidas_from_records(group['records'])
+''')
 
-            # Row 1: Grupo and Texto SICAL
-            html_parts.append(f'''
-                    <tr>
+# Rows rendered for each group: Grupo, Texto SICAL, Aplicación and Importe Líquido.
+# Filled with %-formatting; placeholders in order: name, texto_sical, group_id,
+# texto_sical_js, group_id, partidas, liquido_formatted, group_id, liquido, group_id
+_GROUP_ROW_TEMPLATE = _single_line('''
+                    <tr class="group-start">
                         <td class="label-cell">Grupo</td>
-                        <td class="value-cell"><strong>{group['name']}</strong></td>
+                        <td class="value-cell"><strong>%s</strong></td>
                     </tr>
                     <tr>
                         <td class="label-cell">Texto SICAL</td>
                         <td class="value-cell">
-                            <span class="texto-sical">{texto_sical}</span>
-                            <button class="copy-btn" id="btn_sical_{group_id}" onclick="copyToClipboard('{self._escape_js(texto_sical)}', 'btn_sical_{group_id}')">Copiar</button>
+                            <span class="texto-sical">%s</span> <button class="copy-btn" id="btn_sical_%s" onclick="copyToClipboard('%s', 'btn_sical_%s')">Copiar</button>
                         </td>
                     </tr>
                     <tr>
                         <td class="label-cell">Aplicación</td>
-                        <td class="value-cell">{partidas}</td>
+                        <td class="value-cell">%s</td>
                     </tr>
                     <tr>
                         <td class="label-cell">Importe Líquido</td>
                         <td class="value-cell">
-                            <span class="amount">{liquido_formatted}</span>
-                            <button class="copy-btn" id="btn_amount_{group_id}" onclick="copyToClipboard('{group['liquido']}', 'btn_amount_{group_id}')">Copiar</button>
+                            <span class="amount">%s</span> <button class="copy-btn" id="btn_amount_%s" onclick="copyToClipboard('%s', 'btn_amount_%s')">Copiar</button>
                         </td>
                     </tr>
 ''')
 
-            # Add separator between groups (except after last group)
-            if idx < len(groups) - 1:
-                html_parts.append('                    <tr><td colspan="2" class="group-separator"></td></tr>\n')
-
-        # Footer with total
-        html_parts.append(f'''
+# Closing of each year section; placeholders: year label, formatted total
+_YEAR_FOOTER_TEMPLATE = _single_line('''
                     <tr class="footer-row">
-                        <td>TOTAL {year_label.upper()}</td>
-                        <td class="amount">{self._format_decimal(total_liquido)}</td>
+                        <td>TOTAL %s</td>
+                        <td class="amount">%s</td>
                     </tr>
                 </tbody>
             </table>
         </div>
+
 ''')
 
-        return ''.join(html_parts)
+
+class Group(NamedTuple):
+    """A group of records rendered as one block of the export"""
+    name: str
+    records: List[TributeRecord]
+    liquido: Decimal
+    liquido_cents: int
+
+
+def _to_cents(value: Decimal) -> int:
+    """Convert a currency amount to integer cents"""
+    return int(value.scaleb(2).to_integral_value())
+
+
+def _from_cents(cents: int) -> Decimal:
+    """Convert integer cents back to a Decimal amount with two decimals"""
+    return Decimal(cents).scaleb(-2)
+
+
+def _total_cents(records: List[TributeRecord]) -> int:
+    """Sum the liquido of the records, in cents"""
+    total = 0
+    for record in records:
+        total += _to_cents(record.liquido)
+    return total
+
+
+class HTMLGroupedExporter:
+    """Exports grouped concept records to HTML format"""
+
+    # Mapping of OPAEF concept codes to local contable partidas
+    CORRESP_PARTIDAS = {
+        '751': ['300', 'agua'],  # consumo agua
+        '678': ['300', 'agua'],  # agua alta contador
+        '450': ['300', 'agua'],  # agua consumo
+        '451': ['10049', 'agua'],  # iva agua?
+        '452': ['300', 'agua'],  # agua canon ayto
+        '750': ['300', 'agua'],  # agua cuota fija
+        '568': ['305', 'agua'],  # agua canon junta andalucía
+        '573': ['10049', 'agua'],  # agua iva cuota fija
+        '665': ['10049', 'agua'],  # agua iva agua
+        '752': ['10049', 'agua'],  # agua iva
+        '753': ['10049', 'agua'],  # agua iva conservacion
+        '015': ['116', 'plusvalia'],  # plusvalia ivtnu
+        '022': ['302', 'basuras'],  # basuras
+        '025': ['331', 'cocheras'],  # entr. vehículos
+        '033': ['325', 'exp. doc.'],  # licencia apertura
+        '520': ['325', 'exp. doc.'],  # licencia apertura2
+        '039': ['32903', 'mercado'],  # mercado
+        '062': ['339', 'dom. publico'],  # ocup. via pública
+        '640': ['339', 'dom. publico'],  # tasas ocup dom publico (barraca feria)
+        '649': ['339', 'dom. publico'],  # tasas ocup dom publico (andamios/esco)
+        '663': ['339', 'dom. publico'],  # tasas ocup dom publico (escombros)
+        '329': ['331', 'cocheras'],  # reserva aparcamiento
+        '008': ['32900', 'cementerio'],  # TASAS CEMENTERIO INHUMACION
+        '035': ['32900', 'cementerio'],  # serv. cementerio
+        '372': ['32904', 'guarderia'],  # guardería
+        '398': ['32904', 'guarderia'],  # guardería comedor
+        '516': ['32904', 'guarderia'],  # taller absentismo
+        '806': ['332', 'topv'],  # topv vuelo, suelo, sub, emp suministradoras
+        '462': ['39120', 'multas ant'],  # multas trafico antiguas
+        '512': ['290', 'obras'],  # impuesto de constr, instalaciones y obras
+        '699': ['290', 'obras'],  # prestacion compensatoria ley ou
+        '669': ['399', '399 otros_i'],  # daños via publica
+        # GESTION OPAEF
+        '102': ['114', 'ibi esp'],  # IBI INMEBLES ESPECIALES
+        '204': ['130', 'iae'],  # iae
+        '206': ['130', 'iae'],  # altas iae
+        '205': ['112', 'ibi rus'],  # ibi rústica
+        '208': ['113', 'ibi urb'],  # ibi urbana
+        '213': ['130', 'iae inspeccion'],  # iae inspeccion
+        '218': ['39110', 'multas por infracc trib'],  # multas por infracciones tributarias
+        '501': ['115', 'ivtm'],  # ivtm
+        '700': ['393', 'intereses'],  # intereses de demora
+        '777': ['39120', 'multas'],  # multas tráfico
+    }
+
+    # Partida for each concept code, flattened from CORRESP_PARTIDAS
+    PARTIDA_BY_CODE = {sys.intern(code): partida for code, (partida, _) in CORRESP_PARTIDAS.items()}
+
+    def __init__(self, document: LiquidationDocument, grouping_config: GroupingConfig):
+        """
+        Initialize the HTML exporter
+
+        Args:
+            document: LiquidationDocument with all records
+            grouping_config: GroupingConfig with concept and custom group definitions
+        """
+        self.document = document
+        self.grouping_config = grouping_config
+        # Export and mandamiento dates, formatted once per export
+        self._fecha_export_str = ''
+        self._fecha_mandamiento_str = ''
+        # Document header fields, HTML-escaped once per export
+        self._doc_fields_html: Dict[str, str] = {}
+        # Concept code for each clave_recaudacion seen so far
+        self._concept_code_cache: Dict[str, str] = {}
+        # Currency string for each amount already formatted
+        self._fmt_cache: Dict[Decimal, str] = {}
+        # Formatted partidas for each set of concept codes
+        self._partidas_cache: Dict[frozenset, str] = {}
+        # Compacted string for each sorted tuple of codes already compacted
+        self._compact_cache: Dict[Tuple[str, ...], str] = {}
+        # Records of each year, computed on first use
+        self._year_records = None
+        # Sum of all record liquidos in cents, computed on first use
+        self._total_cents = None
+
+    def _compact_codes(self, codes: List[str]) -> str:
+        """
+        Compact a list of codes, reusing the result for a repeated list.
+
+        Args:
+            codes: List of code strings to compact
+
+        Returns:
+            Compacted string representation (see _compact_codes_impl)
+        """
+        key = tuple(codes)
+        compacted = self._compact_cache.get(key)
+        if compacted is None:
+            compacted = self._compact_codes_impl(codes)
+            self._compact_cache[key] = compacted
+        return compacted
+
+    def _compact_codes_impl(self, codes: List[str]) -> str:
+        """
+        Compact a list of codes by grouping common patterns.
+
+        Examples:
+            026/2021/58/064/573, 026/2021/58/064/665, ...
+            -> 026/2021/58/{064,068,086}/573,665,752,753
+
+            2023/E/0000783, 2023/E/0000784, ...
+            -> 2023/E/783,784,786,787
+
+        The codes must be sorted: five-part codes sharing a base (and a
+        level within it) are then contiguous and are grouped in one sweep.
+
+        Args:
+            codes: Sorted list of unique code strings to compact
+
+        Returns:
+            Compacted string representation
+        """
+        if not codes:
+            return ""
+
+        # Group codes by pattern
+        five_part = []  # [(base, [levels], {suffixes})] in input order
+        current_base = None
+        e_codes = []
+        otros = []
+
+        for c in codes:
+            # No code format has more than five parts, so stop splitting there
+            parts = c.split('/', 4)
+            if len(parts) == 5 and '/' not in parts[4]:
+                # Format: 026/2021/58/064/573
+                base = (parts[0], parts[1], parts[2])  # (026, 2021, 58)
+                level = parts[3]  # 064
+                suffix = parts[4]  # 573
+                if base != current_base:
+                    current_base = base
+                    levels = []
+                    suffixes = set()
+                    five_part.append((base, levels, suffixes))
+                if not levels or levels[-1] != level:
+                    levels.append(level)
+                suffixes.add(suffix)
+            elif len(parts) == 3 and parts[1] == 'E':
+                # Format: 2023/E/0000783
+                # Remove leading zeros from number
+                num = parts[2].lstrip('0') or '0'
+                e_codes.append(num)
+            else:
+                # Unknown format, keep as-is
+                otros.append(c)
+
+        result = []
+
+        # Format five-part codes. Bases and levels already arrive in order for
+        # ordinary codes, so these sorts only guard against unusual characters
+        for base, levels, suffixes in sorted(five_part, key=lambda entry: entry[0]):
+            # Suffixes are the union across all levels of the base
+            suffixes_str = ','.join(sorted(suffixes))
+
+            # Format: 026/2021/58/{064,068,086}/573,665,752,753
+            base_str = '/'.join(base)
+            levels_str = '{' + ','.join(sorted(levels)) + '}'
+            result.append(f"{base_str}/{levels_str}/{suffixes_str}")
+
+        # Format E-codes (sort numerically)
+        if e_codes:
+            # Sort numerically
+            sorted_e = sorted(e_codes, key=lambda x: int(x) if x.isdigit() else 0)
+            result.append(f"2023/E/{','.join(sorted_e)}")
+
+        # Add other codes as-is
+        result.extend(otros)
+
+        return ' '.join(result)
+
+    def _concept_code(self, clave_recaudacion: str) -> str:
+        """
+        Concept code of a clave_recaudacion, parsed once per distinct clave
+
+        Args:
+            clave_recaudacion: Collection code, e.g. '026/2024/20/100/208'
+
+        Returns:
+            Concept code, e.g. '208'
+        """
+        code = self._concept_code_cache.get(clave_recaudacion)
+        if code is None:
+            # Interned so the many dict lookups keyed by code compare by identity
+            code = sys.intern(self.grouping_config.get_concept_code(clave_recaudacion))
+            self._concept_code_cache[clave_recaudacion] = code
+        return code
+
+    def _get_partidas_from_records(self, records: List[TributeRecord]) -> str:
+        """
+        Extract unique partidas from records and format them.
+
+        Args:
+            records: List of tribute records
+
+        Returns:
+            Formatted string with partidas, e.g., "300, 10049"
+        """
+        # Partidas only depend on the set of concept codes in the group
+        get_code = self._concept_code
+        concept_codes = frozenset(get_code(record.clave_recaudacion) for record in records)
+
+        partidas = self._partidas_cache.get(concept_codes)
+        if partidas is not None:
+            return partidas
+
+        get_partida = self.PARTIDA_BY_CODE.get
+        partidas_set = {get_partida(code) for code in concept_codes}
+        partidas_set.discard(None)
+
+        # Return sorted unique partidas as comma-separated string
+        if partidas_set:
+            partidas = ', '.join(sorted(partidas_set))
+        else:
+            # If no partidas found, return a default value
+            partidas = 'N/A'
+
+        self._partidas_cache[concept_codes] = partidas
+        return partidas
+
+    def export_grouped_concepts(
+        self,
+        output_path: str,
+        group_by_year: bool = True,
+        group_by_concept: bool = True,
+        group_by_custom: bool = False,
+        compress: bool = False
+    ) -> None:
+        """
+        Export grouped concept records to HTML
+
+        Args:
+            output_path: Path where to save the HTML file
+            group_by_year: Whether to group by year
+            group_by_concept: Whether to group by concept
+            group_by_custom: Whether to apply custom grouping
+            compress: Whether to gzip the HTML while writing it (e.g. for .html.gz)
+        """
+        # Organize data according to grouping settings, before touching any file
+        grouped_data = self._organize_data(group_by_year, group_by_concept, group_by_custom)
+
+        # Stream the HTML to a temporary file next to the target instead of building
+        # it in memory, and move it into place once complete: a failed export never
+        # leaves a truncated file where a previous export was
+        output_path = Path(output_path)
+        tmp_path = output_path.with_name(output_path.name + '.tmp')
+        try:
+            if compress:
+                # Level 1 keeps compression about as cheap as the raw write
+                output_file = gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=1)
+            else:
+                output_file = open(tmp_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE)
+
+            with output_file:
+                self._stream_grouped_concepts(output_file, grouped_data, group_by_year, group_by_concept, group_by_custom)
+
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _stream_grouped_concepts(
+        self,
+        out: TextIO,
+        grouped_data: Dict,
+        group_by_year: bool,
+        group_by_concept: bool,
+        group_by_custom: bool
+    ) -> None:
+        """
+        Write the grouped concepts HTML document to an open text stream
+
+        Args:
+            out: Writable text stream receiving the document fragment by fragment
+            grouped_data: Groups to write, as returned by _organize_data
+            group_by_year: Whether to group by year
+            group_by_concept: Whether to group by concept
+            group_by_custom: Whether to apply custom grouping
+        """
+        # Dates shown in every section, formatted once so they all agree
+        self._fecha_export_str = datetime.now().strftime('%d/%m/%Y %H:%M')
+        self._fecha_mandamiento_str = (
+            self.document.fecha_mandamiento.strftime('%d/%m/%Y') if self.document.fecha_mandamiento else 'N/A'
+        )
+
+        # Document fields come from the PDF, so they are HTML-escaped (once per
+        # export); the static markup around them is written untouched
+        self._doc_fields_html = {
+            name: escape(str(getattr(self.document, name)))
+            for name in ('entidad', 'codigo_entidad', 'numero_liquidacion', 'mandamiento_pago')
+        }
+
+        self._generate_html(out.write, grouped_data, group_by_year, group_by_concept, group_by_custom)
+
+    def _organize_data(
+        self,
+        group_by_year: bool,
+        group_by_concept: bool,
+        group_by_custom: bool
+    ) -> Dict:
+        """
+        Organize records according to grouping configuration
+
+        Returns:
+            Dictionary with organized data structure
+        """
+        if group_by_year:
+            # Group by year first (years come out in ascending order)
+            return {
+                year: self._organize_records(year_records, group_by_concept, group_by_custom)
+                for year, year_records in self._records_by_year().items()
+            }
+        else:
+            # All records together
+            return {None: self._organize_records(self.document.tribute_records, group_by_concept, group_by_custom)}
+
+    def _records_by_year(self) -> Dict[int, List[TributeRecord]]:
+        """
+        Records of each year, computed once per exporter.
+
+        Records are sorted by (ejercicio, clave_recaudacion) so each year is a
+        contiguous run, split off in one scan; later exports reuse the result.
+
+        Returns:
+            Dictionary {ejercicio: records} in ascending year order
+        """
+        if self._year_records is None:
+            records = sorted(self.document.tribute_records, key=attrgetter('ejercicio', 'clave_recaudacion'))
+            self._year_records = {
+                year: list(year_records)
+                for year, year_records in groupby(records, key=attrgetter('ejercicio'))
+            }
+        return self._year_records
+
+    def _organize_records(
+        self,
+        records: List[TributeRecord],
+        group_by_concept: bool,
+        group_by_custom: bool
+    ) -> List[Group]:
+        """
+        Organize a list of records into groups
+
+        Returns:
+            List of Group tuples with name, records, and totals
+        """
+        if not group_by_concept and not group_by_custom:
+            # Return all records as one group
+            if records is self.document.tribute_records:
+                total_cents = self._document_total_cents()
+            else:
+                total_cents = _total_cents(records)
+            return [Group('Todos los conceptos', records, _from_cents(total_cents), total_cents)]
+
+        groups = []
+
+        # Amounts are accumulated as integer cents and only turned back into
+        # Decimal for each finished group
+        cents = [_to_cents(r.liquido) for r in records]
+
+        # Bind lookups used inside the record loops
+        get_code = self._concept_code
+        get_name = self.grouping_config.concept_names.get
+
+        # Concept codes of each custom group as a set, for O(1) membership tests
+        custom_sets = [
+            (custom_group, frozenset(custom_group.concept_codes))
+            for custom_group in self.grouping_config.custom_groups
+        ] if group_by_custom else []
+
+        # Resolve each distinct clave_recaudacion to its concept code once
+        code_by_key = {
+            clave: get_code(clave)
+            for clave in {r.clave_recaudacion for r in records}
+        }
+
+        if group_by_concept:
+            # Both concept branches start from the same per-code buckets
+            concept_buckets = self._bucket_by_concept(records, cents, code_by_key)
+
+        if group_by_concept and not group_by_custom:
+            # Group by concept only: codes sharing a display name are merged
+            # {name: [records, liquido_cents]}
+            concept_groups: Dict[str, list] = {}
+            for concept_code, (concept_records, liquido_cents) in concept_buckets.items():
+                concept_name = get_name(concept_code, concept_code)
+                entry = concept_groups.get(concept_name)
+                if entry is None:
+                    concept_groups[concept_name] = [concept_records, liquido_cents]
+                else:
+                    entry[0].extend(concept_records)
+                    entry[1] += liquido_cents
+
+            for concept_name, (concept_records, liquido_cents) in sorted(concept_groups.items()):
+                groups.append(Group(concept_name, concept_records, _from_cents(liquido_cents), liquido_cents))
+
+        elif group_by_custom:
+            # Apply custom grouping
+            if group_by_concept:
+                # First group by concept, then apply custom groups to concepts
+                used_concepts = set()
+                for custom_group, concept_codes in custom_sets:
+                    group_records = []
+                    group_cents = 0
+                    # Concepts of this group present in the records, in a stable order
+                    for concept_code in sorted(concept_codes & concept_buckets.keys()):
+                        concept_records, liquido_cents = concept_buckets[concept_code]
+                        group_records.extend(concept_records)
+                        group_cents += liquido_cents
+                        used_concepts.add(concept_code)
+
+                    if group_records:
+                        groups.append(Group(custom_group.name, group_records, _from_cents(group_cents), group_cents))
+
+                # Add ungrouped concepts
+                for concept_code, (concept_records, liquido_cents) in sorted(concept_buckets.items()):
+                    if concept_code not in used_concepts:
+                        concept_name = get_name(concept_code, concept_code)
+                        groups.append(Group(concept_name, concept_records, _from_cents(liquido_cents), liquido_cents))
+            else:
+                # Apply custom groups directly to records in a single pass.
+                # A code may belong to several custom groups, in which case
+                # its records are listed in each of them
+                groups_by_code: Dict[str, List[int]] = {}
+                for group_idx, (_, concept_codes) in enumerate(custom_sets):
+                    for concept_code in concept_codes:
+                        groups_by_code.setdefault(concept_code, []).append(group_idx)
+
+                # [records, liquido_cents] per custom group, in custom_sets order
+                accumulated = [[[], 0] for _ in custom_sets]
+                ungrouped_records = []
+                ungrouped_cents = 0
+                for record, record_cents in zip(records, cents):
+                    member_of = groups_by_code.get(code_by_key[record.clave_recaudacion])
+                    if member_of is None:
+                        ungrouped_records.append(record)
+                        ungrouped_cents += record_cents
+                        continue
+                    for group_idx in member_of:
+                        entry = accumulated[group_idx]
+                        entry[0].append(record)
+                        entry[1] += record_cents
+
+                for (custom_group, _), (group_records, group_cents) in zip(custom_sets, accumulated):
+                    if group_records:
+                        groups.append(Group(custom_group.name, group_records, _from_cents(group_cents), group_cents))
+
+                # Add ungrouped records
+                if ungrouped_records:
+                    groups.append(Group('Sin agrupar', ungrouped_records, _from_cents(ungrouped_cents), ungrouped_cents))
+
+        return groups
+
+    def _bucket_by_concept(
+        self,
+        records: List[TributeRecord],
+        cents: List[int],
+        code_by_key: Dict[str, str]
+    ) -> Dict[str, list]:
+        """
+        Bucket records by concept code in a single pass
+
+        Args:
+            records: List of tribute records
+            cents: Liquido of each record in cents, parallel to records
+            code_by_key: Concept code for each clave_recaudacion
+
+        Returns:
+            Dictionary {concept_code: [records, liquido_cents]} in first-seen order
+        """
+        buckets: Dict[str, list] = defaultdict(lambda: [[], 0])
+        for record, record_cents in zip(records, cents):
+            entry = buckets[code_by_key[record.clave_recaudacion]]
+            entry[0].append(record)
+            entry[1] += record_cents
+
+        # Callers index the buckets directly, so stop creating missing entries
+        buckets.default_factory = None
+        return buckets
+
+    def _document_total_cents(self) -> int:
+        """
+        Total liquido of all the document's records, in cents.
+
+        Summed from the records rather than taken from document.total_liquido,
+        which is the figure read from the PDF and may not match the records.
+        """
+        if self._total_cents is None:
+            self._total_cents = _total_cents(self.document.tribute_records)
+        return self._total_cents
+
+    def _collect_unique_claves(self, records: List[TributeRecord]) -> Tuple[str, str]:
+        """
+        Collect unique clave_recaudacion and clave_contabilidad from records
+        and compact them using the _compact_codes method.
+
+        Returns:
+            Tuple of (claves_recaudacion_str, claves_contabilidad_str)
+        """
+        # Collect both sets of claves in a single pass over the records
+        claves_recaudacion = set()
+        claves_contabilidad = set()
+        for record in records:
+            claves_recaudacion.add(record.clave_recaudacion)
+            claves_contabilidad.add(record.clave_contabilidad)
+
+        # Compact the codes (cached per sorted code list)
+        compacted_recaudacion = self._compact_codes(sorted(claves_recaudacion))
+        compacted_contabilidad = self._compact_codes(sorted(claves_contabilidad))
+
+        return compacted_recaudacion, compacted_contabilidad
+
+    def _build_texto_sical(self, ejercicio: int, group_name: str, records: List[TributeRecord]) -> str:
+        """
+        Build the texto SICAL string for a group
+
+        Format: OPAEF. REGULARIZACION COBROS {ejercicio} - {nombre_grupo} LIQ. {num} MTO. PAGO {mto} {claves_rec} {claves_cont}
+
+        Args:
+            ejercicio: Fiscal year
+            group_name: Name of the group
+            records: List of tribute records for this group
+
+        Returns:
+            Formatted texto SICAL string
+        """
+        claves_rec, claves_cont = self._collect_unique_claves(records)
+
+        # Build the texto with ejercicio and group name
+        return (
+            f"OPAEF. REGULARIZACION COBROS {ejercicio} - {group_name} "
+            f"LIQ. {self.document.numero_liquidacion} "
+            f"MTO. PAGO {self.document.mandamiento_pago} {claves_rec} {claves_cont}"
+        )
+
+    def _format_decimal(self, value: Decimal) -> str:
+        """Format decimal value as currency string"""
+        formatted = self._fmt_cache.get(value)
+        if formatted is None:
+            formatted = f"{value:,.2f} €".translate(_ES_NUMBER)
+            self._fmt_cache[value] = formatted
+        return formatted
+
+    def _generate_html(
+        self,
+        write: Callable[[str], Any],
+        grouped_data: Dict,
+        group_by_year: bool,
+        group_by_concept: bool,
+        group_by_custom: bool
+    ) -> None:
+        """
+        Generate complete HTML document
+
+        Args:
+            write: Callable receiving each HTML fragment in document order
+        """
+        # Each section ends with its own blank line, so fragments are written as-is
+        write(self._html_header())
+        write(self._html_document_info())
+
+        # Generate tables for each year (or single table if not grouped by year)
+        for year, groups in grouped_data.items():
+            self._html_year_table(write, year, groups)
+
+        write(self._html_footer())
+
+    def _html_header(self) -> str:
+        """Generate HTML header with CSS and JavaScript"""
+        return _HEADER_HTML
+
+    def _html_document_info(self) -> str:
+        """Generate document information section"""
+        doc = self._doc_fields_html
+        return f'''
+        <div class="header">
+            <h1>Liquidación OPAEF - Agrupación por Conceptos</h1>
+            <button class="print-btn" onclick="printReport()">🖨️ Imprimir</button>
+        </div>
+
+        <div class="doc-info">
+            <div class="doc-info-item">
+                <div class="doc-info-label">Entidad</div>
+                <div class="doc-info-value">{doc['entidad']} ({doc['codigo_entidad']})</div>
+            </div>
+            <div class="doc-info-item">
+                <div class="doc-info-label">Nº Liquidación</div>
+                <div class="doc-info-value">{doc['numero_liquidacion']}</div>
+            </div>
+            <div class="doc-info-item">
+                <div class="doc-info-label">Mandamiento de Pago</div>
+                <div class="doc-info-value">{doc['mandamiento_pago']}</div>
+            </div>
+            <div class="doc-info-item">
+                <div class="doc-info-label">Fecha Mandamiento</div>
+                <div class="doc-info-value">{self._fecha_mandamiento_str}</div>
+            </div>
+            <div class="doc-info-item">
+                <div class="doc-info-label">Ejercicio</div>
+                <div class="doc-info-value">{self.document.ejercicio}</div>
+            </div>
+            <div class="doc-info-item">
+                <div class="doc-info-label">Fecha Exportación</div>
+                <div class="doc-info-value">{self._fecha_export_str}</div>
+            </div>
+        </div>
+
+'''
+
+    def _html_year_table(self, write: Callable[[str], Any], year: int, groups: List[Group]) -> None:
+        """Generate HTML table for a year's groups"""
+        year_label = f"Ejercicio {year}" if year else "Todos los ejercicios"
+
+        # Loop invariants, bound once for all groups
+        fmt = self._format_decimal
+        build_texto_sical = self._build_texto_sical
+        get_partidas = self._get_partidas_from_records
+        escape_js = self._escape_js
+        # Use the year if available, otherwise use the document's ejercicio
+        ejercicio = year if year is not None else self.document.ejercicio
+
+        # Print header with the document info, then the table head
+        write(_YEAR_HEADER_TEMPLATE.format(
+            **self._doc_fields_html,
+            fecha_mandamiento=self._fecha_mandamiento_str,
+            fecha_export=self._fecha_export_str,
+            year=year,
+            year_label=year_label
+        ))
+
+        # Generate rows for each group, accumulating the footer total in cents
+        total_cents = 0
+        for idx, group in enumerate(groups):
+            total_cents += group.liquido_cents
+            group_id = f"group_{year}_{idx}"
+            texto_sical = build_texto_sical(ejercicio, group.name, group.records)
+            liquido_formatted = fmt(group.liquido)
+            # Get partidas for this group
+            partidas = get_partidas(group.records)
+
+            # JS string literal inside an HTML attribute: escape for both
+            texto_sical_js = escape(escape_js(texto_sical))
+
+            write(_GROUP_ROW_TEMPLATE % (
+                escape(group.name), escape(texto_sical), group_id,
+                texto_sical_js, group_id,
+                partidas,
+                liquido_formatted, group_id, group.liquido, group_id
+            ))
+
+        # Footer with total
+        write(_YEAR_FOOTER_TEMPLATE % (year_label.upper(), fmt(_from_cents(total_cents))))
 
     def _html_footer(self) -> str:
         """Generate HTML footer"""
-        return '''
-    </div>
-</body>
-</html>
-'''
+        return _FOOTER_HTML
 
     def _escape_js(self, text: str) -> str:
         """Escape text for use in JavaScript string"""
-        return text.replace("'", "\\'").replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r')
+        return text.translate(_JS_ESCAPE)
 
 
 def export_grouped_to_html(
@@ -938,7 +1253,8 @@ def export_grouped_to_html(
     output_path: str,
     group_by_year: bool = True,
     group_by_concept: bool = True,
-    group_by_custom: bool = False
+    group_by_custom: bool = False,
+    compress: bool = False
 ) -> None:
     """
     Convenience function to export grouped concepts to HTML
@@ -950,6 +1266,7 @@ def export_grouped_to_html(
         group_by_year: Whether to group by year
         group_by_concept: Whether to group by concept
         group_by_custom: Whether to apply custom grouping
+        compress: Whether to gzip the HTML while writing it (e.g. for .html.gz)
     """
     exporter = HTMLGroupedExporter(document, grouping_config)
-    exporter.export_grouped_concepts(output_path, group_by_year, group_by_concept, group_by_custom)
+    exporter.export_grouped_concepts(output_path, group_by_year, group_by_concept, group_by_custom, compress)
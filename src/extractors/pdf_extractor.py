@@ -4,8 +4,12 @@ PDF Extractor for Liquidation Documents (Documentos de Liquidación).
 This module uses pdfplumber to extract structured data from PDF liquidation documents.
 Accuracy is critical for accounting purposes.
 """
+import logging
 import re
 import pdfplumber
+from pdfplumber.table import TableSettings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, zip_longest
 from decimal import Decimal
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
@@ -21,24 +25,195 @@ from src.models.liquidation import (
     RefundSummary
 )
 
+logger = logging.getLogger(__name__)
+
+# Header fields (page 1 text)
+_RE_EJERCICIO = re.compile(r'EJERCICIO\s+(\d{4})')
+_RE_MANDAMIENTO = re.compile(r'Mandamiento de pago:\s*([\d/]+)')
+_RE_FECHA_MANDAMIENTO = re.compile(r'Fecha de mandamiento:\s*(\d{2}/\d{2}/\d{4})')
+_RE_NUMERO_LIQUIDACION = re.compile(r'Número de liquidación:\s*(\d+)')
+_RE_ENTIDAD = re.compile(r'\((\d+)\)\s+(.+?)(?=\n|$)')
+_RE_CODIGO_VERIFICACION = re.compile(r'Código Seguro De Verificación:\s*(\S+)')
+_RE_FIRMADO_POR = re.compile(r'Firmado Por\s+(.+?)(?=\s+Firmado)')
+_RE_FECHA_FIRMA = re.compile(r'Firmado\s+(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2})')
+
+# Tribute rows
+_RE_CLAVE_CONTABILIDAD = re.compile(r'\d{4}/[A-Z]/\d+')  # e.g. 2025/M/0000731
+# Year in a clave_recaudacion, in one pass: group 1 is the YYYY of the first 026/YYYY/
+# (preferred), group 2 the first 4-digit run when there is no such form
+_RE_CLAVE_RECAUDACION_YEAR = re.compile(r'.*?026/(\d{4})/|.*?(\d{4})', re.DOTALL)
+_RE_YEAR = re.compile(r'(\d{4})')
+_RE_WHITESPACE = re.compile(r'\s+')
+# Record tables have 10 columns, i.e. 11 vertical boundaries
+_RECORD_TABLE_COLUMN_LINES = 11
+# Column header rows, and header or exercise total rows (never partial records)
+_RE_HEADER_ROW = re.compile(r'CONCEPTO|CLAVE', re.IGNORECASE)
+_RE_HEADER_OR_TOTAL_ROW = re.compile(r'CONCEPTO|CLAVE|TOTAL EJERCICIO', re.IGNORECASE)
+
+# Amounts: European 1.234,56 -> 1234.56 in a single pass (drop thousands dots, comma to dot)
+_EUROPEAN_AMOUNT_TABLE = str.maketrans({'.': None, ',': '.'})
+
+# Totals table lines (page with the TOTAL table)
+_RE_VOLUNTARIA = re.compile(r'VOLUNTARIA\s+([\d.,]+)')
+_RE_EJECUTIVA = re.compile(r'EJECUTIVA\s+([\d.,]+)')
+_RE_RECARGO = re.compile(r'RECARGO\s+([\d.,]+)')
+_RE_LIQUIDO_LABEL = re.compile(r'L[IÍ]QUIDO', re.IGNORECASE)
+_RE_LIQUIDO = re.compile(r'L[IÍ]QUIDO\s+([\d.,]+)', re.IGNORECASE)
+_RE_A_LIQUIDAR = re.compile(r'A\s+LIQUIDAR\s+([\d.,]+)')
+# Which total a TOTAL table line holds, tested in a single match: a line starting with
+# VOLUNTARIA, EJECUTIVA or RECARGO, else a DIPUTACIÓN line naming one of them (the
+# alternatives keep the priority of the original one-by-one checks)
+_RE_TOTAL_LINE_LABEL = re.compile(
+    r'(?P<voluntaria>VOLUNTARIA)|(?P<ejecutiva>EJECUTIVA)|(?P<recargo>RECARGO)'
+    r'|(?=.*(?i:DIPUTACI))(?:(?=.*VOLUNTARIA)(?P<diputacion_voluntaria>)'
+    r'|(?=.*EJECUTIVA)(?P<diputacion_ejecutiva>)|(?=.*RECARGO)(?P<diputacion_recargo>))',
+    re.DOTALL
+)
+# Amount pattern of each totals field, by the label group that matched
+_TOTAL_LINE_AMOUNTS = {
+    'voluntaria': _RE_VOLUNTARIA,
+    'ejecutiva': _RE_EJECUTIVA,
+    'recargo': _RE_RECARGO,
+    'diputacion_voluntaria': _RE_VOLUNTARIA,
+    'diputacion_ejecutiva': _RE_EJECUTIVA,
+    'diputacion_recargo': _RE_RECARGO,
+}
+
+# Deductions table lines
+_RE_AMOUNT = re.compile(r'([\d.,]+)')
+_RE_TRAILING_AMOUNT = re.compile(r'([\d.,]+)$')
+_RE_TASA_VOLUNTARIA = re.compile(r'TASA VOLUNTARIA\s+([\d.,]+)')
+_RE_SIN_RECARGO = re.compile(r'SIN RECARGO\s+([\d.,]+)')
+_RE_TASA_EJECUTIVA = re.compile(r'TASA EJECUTIVA\s+([\d.,]+)')
+_RE_TRIBUTARIA = re.compile(r'TRIBUTARIA\s+([\d.,]+)')
+_RE_CENSAL = re.compile(r'CENSAL\s+([\d.,]+)')
+_RE_CATASTRAL = re.compile(r'CATASTRAL\s+([\d.,]+)')
+_RE_RECAUDACION = re.compile(r'RECAUDACIÓN\s+([\d.,]+)')
+_RE_INSPECCION = re.compile(r'INSPECCIÓN\s+([\d.,]+)')
+_RE_TRAFICO = re.compile(r'TRÁFICO\s+([\d.,]+)')
+_RE_TRAFICO_UNACCENTED = re.compile(r'TRAFICO\s+([\d.,]+)')
+_RE_REPERCUTIDOS = re.compile(r'REPERCUTIDOS\s+([\d.,]+)')
+_RE_ANTICIPOS = re.compile(r'ANTICIPOS\s+([\d.,]+)')
+_RE_ANTICIPO = re.compile(r'ANTICIPO\s+([\d.,]+)')
+_RE_INDEBIDOS = re.compile(r'INDEBIDOS\s+([\d.,]+)')
+
+# Deductions in the page text, by DeductionDetail field (fallback when no table is parsed)
+_DEDUCTION_TEXT_PATTERNS: Dict[str, re.Pattern] = {
+    'tasa_voluntaria': re.compile(r'-?\s*TASA VOLUNTARIA\s+([\d.,]+)'),
+    'tasa_ejecutiva': re.compile(r'-?\s*TASA EJECUTIVA(?!\s+SIN)\s+([\d.,]+)'),
+    'tasa_ejecutiva_sin_recargo': re.compile(r'-?\s*TASA EJECUTIVA SIN RECARGO\s+([\d.,]+)'),
+    'tasa_gestion_censal': re.compile(r'-?\s*TASA GESTIÓN CENSAL\s+([\d.,]+)'),
+    'tasa_gestion_catastral': re.compile(r'-?\s*TASA GESTIÓN CATASTRAL\s+([\d.,]+)'),
+    'tasa_gestion_tributaria': re.compile(r'-?\s*TASA GESTIÓN TRIBUTARIA\s+([\d.,]+)'),
+    'tasa_multas_trafico': re.compile(r'-?\s*TASA MULTAS DE TRÁFICO\s+([\d.,]+)'),
+    'tasa_sancion_tributaria': re.compile(r'-?\s*TASA SANCIÓN TRIBUTARIA\s+([\d.,]+)'),
+    'tasa_sancion_recaudacion': re.compile(r'-?\s*TASA SANCIÓN RECAUDACIÓN\s+([\d.,]+)'),
+    'tasa_sancion_inspeccion': re.compile(r'-?\s*TASA SANCIÓN INSPECCIÓN\s+([\d.,]+)'),
+    'gastos_repercutidos': re.compile(r'-?\s*GASTOS REPERCUTIDOS\s+([\d.,]+)'),
+    'anticipos': re.compile(r'-?\s*ANTICIPOS\s+([\d.,]+)'),
+    'intereses_por_anticipo': re.compile(r'-?\s*INTERESES POR ANTICIPO\s+([\d.,]+)'),
+    'expedientes_ingresos_indebidos': re.compile(r'-?\s*EXPEDIENTES INGRESOS INDEBIDOS\s+([\d.,]+)'),
+}
+
+# LÍQUIDO as it appears in table text: with or without accent, or with a broken accent
+_LIQUIDO_SPELLINGS = ('LIQUIDO', 'LÍQUIDO', 'L�QUIDO')
+
+# Refund rows start with the expediente number, e.g. 2024/123
+_RE_EXPTE = re.compile(r'\d{4}/\d+')
+
 
 class PDFExtractionError(Exception):
     """Raised when PDF extraction fails."""
     pass
 
 
+def _extract_pages_tables(pdf_path: Path, page_indices: List[int],
+                          table_settings: Dict[str, Any]) -> List[Optional[List]]:
+    """
+    Extract the tables of a batch of pages in a worker process.
+
+    The PDF is opened once per batch inside the worker, since pdfplumber
+    objects cannot be shared between processes.
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_indices: Zero-based indices of the pages to extract
+        table_settings: pdfplumber table extraction settings
+
+    Returns:
+        The tables of each page, in the order of page_indices (None for a
+        page whose extraction failed, so the caller can retry it in-process)
+    """
+    results = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_idx in page_indices:
+            page = pdf.pages[page_idx]
+            try:
+                results.append(page.extract_tables(table_settings=table_settings))
+            except Exception:
+                results.append(None)
+            finally:
+                page.flush_cache()
+    return results
+
+
+def _has_record_rows(tables: List[List]) -> bool:
+    """Whether any table row has a clave_contabilidad in column 1, as record rows do."""
+    return any(
+        len(row) > 1 and row[1] and _RE_CLAVE_CONTABILIDAD.search(str(row[1]))
+        for table in tables
+        for row in table
+        if row
+    )
+
+
+def _table_has_tokens(table: List[List], tokens: Tuple, ignore_case: bool = False) -> bool:
+    """
+    Whether every token occurs in some cell of a table.
+
+    Cells are scanned one by one, stopping as soon as all tokens have been
+    seen, instead of joining the whole table into a single string first.
+
+    Args:
+        table: Table rows as returned by pdfplumber
+        tokens: Substrings to look for (without spaces, so none could span two
+            cells); a tuple of alternative spellings counts as found if any is
+        ignore_case: Compare against the upper-cased cell text (tokens in upper case)
+
+    Returns:
+        True if all tokens were found
+    """
+    missing = list(tokens)
+    for row in table:
+        for cell in row:
+            if not cell:
+                continue
+            text = str(cell).upper() if ignore_case else str(cell)
+            missing = [token for token in missing
+                       if not (any(t in text for t in token) if isinstance(token, tuple) else token in text)]
+            if not missing:
+                return True
+    return False
+
+
 class LiquidationPDFExtractor:
     """
     Extracts data from liquidation PDF documents with high accuracy.
     """
 
-    def __init__(self, pdf_path: str, table_settings: Optional[Dict[str, Any]] = None):
+    def __init__(self, pdf_path: str, table_settings: Optional[Dict[str, Any]] = None,
+                 max_workers: int = 1, reuse_column_lines: bool = False):
         """
         Initialize extractor with PDF file path.
 
         Args:
             pdf_path: Path to the PDF file to extract
             table_settings: Optional dictionary of pdfplumber table extraction settings
+            max_workers: Worker processes used to extract the tables of the record
+                pages. With 1 (the default) everything runs in-process.
+            reuse_column_lines: Detect the column boundaries of the record table
+                once and pass them as explicit vertical lines for the following
+                record pages, skipping vertical line detection there
         """
         self.pdf_path = Path(pdf_path)
         if not self.pdf_path.exists():
@@ -46,6 +221,8 @@ class LiquidationPDFExtractor:
 
         # Store table extraction settings
         self.table_settings = table_settings if table_settings is not None else {}
+        self.max_workers = max_workers
+        self.reuse_column_lines = reuse_column_lines
 
         # Store partial row from previous page (for cross-page continuations)
         self._pending_partial_row = None
@@ -53,6 +230,14 @@ class LiquidationPDFExtractor:
         self._last_processed_row = None
         # Flag to signal that the last global record should be replaced (cross-page backward merge)
         self._replace_last_record = False
+        # Parsed value of each amount string already seen (most cells repeat, e.g. "0,00")
+        self._amount_cache: Dict[str, Decimal] = {}
+        # Text of each page already extracted in the current extraction, by page number
+        self._page_text_cache: Dict[int, str] = {}
+        # Tables of the pages still needed (see _page_tables), by page number
+        self._page_tables_cache: Dict[int, List] = {}
+        # Column boundaries (x coordinates) of the record table, when reused across pages
+        self._column_lines: Optional[List[float]] = None
 
     def extract(self) -> LiquidationDocument:
         """
@@ -66,15 +251,20 @@ class LiquidationPDFExtractor:
         """
         try:
             with pdfplumber.open(self.pdf_path) as pdf:
-                num_pages = len(pdf.pages)
+                # Materialize the page list once; every step below indexes into it
+                pages = list(pdf.pages)
+                num_pages = len(pages)
 
                 # Reset pending partial row, last processed row, and replacement flag at start of extraction
                 self._pending_partial_row = None
                 self._last_processed_row = None
                 self._replace_last_record = False
+                self._page_text_cache = {}
+                self._page_tables_cache = {}
+                self._column_lines = None
 
                 # Extract header information from page 1
-                header_data = self._extract_header(pdf.pages[0])
+                header_data = self._extract_header(pages[0])
 
                 # Extract tribute records from ALL pages (multi-page documents)
                 tribute_records = []
@@ -83,13 +273,20 @@ class LiquidationPDFExtractor:
                 # Process ALL pages except the VERY LAST ONE (which has totals/summaries)
                 # Even the second-to-last page might have tribute records!
                 pages_to_process = num_pages - 1 if num_pages > 1 else num_pages
+                # Table detection is the expensive part and has no cross-page state,
+                # so it can run in worker processes; the merging below stays sequential
+                page_tables = self._extract_tables_parallel(pages_to_process)
                 for page_idx in range(pages_to_process):
                     try:
-                        records, summaries = self._extract_tribute_records(pdf.pages[page_idx])
+                        tables = page_tables[page_idx] if page_tables else None
+                        if tables is not None:
+                            # Plain table_settings extraction: _page_tables can reuse it
+                            self._page_tables_cache[pages[page_idx].page_number] = tables
+                        records, summaries = self._extract_tribute_records(pages[page_idx], tables)
 
                         # Check if we need to replace the last record (cross-page backward merge)
                         if self._replace_last_record and tribute_records:
-                            print(f"DEBUG: Replacing last global record due to cross-page backward merge")
+                            logger.debug("Replacing last global record due to cross-page backward merge")
                             tribute_records.pop()
                             self._replace_last_record = False
 
@@ -98,8 +295,17 @@ class LiquidationPDFExtractor:
                         if summaries:
                             exercise_summaries.extend(summaries)
                     except Exception as e:
-                        print(f"Warning: Failed to extract from page {page_idx + 1}: {e}")
+                        logger.warning("Failed to extract from page %d: %s", page_idx + 1, e)
                         continue
+                    finally:
+                        # Release the page's parsed layout once its records are read, so memory
+                        # stays at about one page; the last page is still needed for the totals
+                        if page_idx < num_pages - 1:
+                            pages[page_idx].flush_cache()
+                        # Its tables are only kept for the second-to-last page, the one
+                        # the backwards totals search checks right after the last page
+                        if page_idx < num_pages - 2:
+                            self._page_tables_cache.pop(pages[page_idx].page_number, None)
 
                 # Extract totals and deductions by finding TOTAL table (structure-based, not page-based)
                 totals = {'voluntaria': Decimal('0'), 'ejecutiva': Decimal('0'), 'recargo': Decimal('0'),
@@ -110,18 +316,18 @@ class LiquidationPDFExtractor:
 
                 if num_pages >= 2:
                     # Search ALL pages for the TOTAL table (not hardcoded page numbers)
-                    totals, deductions, advance_breakdown = self._find_and_extract_totals(pdf.pages)
+                    totals, deductions, advance_breakdown = self._find_and_extract_totals(pages)
 
                 # Extract refunds from last page if exists
                 refund_records = []
                 refund_summaries = []
                 if num_pages >= 3:
                     try:
-                        refund_records, refund_summaries = self._extract_refunds(pdf.pages[num_pages - 1])
+                        refund_records, refund_summaries = self._extract_refunds(pages[-1])
                     except:
                         # If last page fails, try page 2 (original logic)
                         if num_pages >= 3:
-                            refund_records, refund_summaries = self._extract_refunds(pdf.pages[2])
+                            refund_records, refund_summaries = self._extract_refunds(pages[2])
 
                 # Build complete document
                 doc = LiquidationDocument(
@@ -155,48 +361,113 @@ class LiquidationPDFExtractor:
         except Exception as e:
             raise PDFExtractionError(f"Failed to extract PDF {self.pdf_path}: {str(e)}") from e
 
+    def _extract_tables_parallel(self, num_pages: int) -> Optional[List[Optional[List]]]:
+        """
+        Extract the tables of the first num_pages pages using worker processes.
+
+        Pages are split into contiguous batches, one per worker, so each worker
+        opens the PDF only once.
+
+        Args:
+            num_pages: Number of pages (from the first one) to extract
+
+        Returns:
+            Tables of each page in page order, or None when running in-process
+            (including when the worker pool fails)
+        """
+        workers = min(self.max_workers, num_pages)
+        if workers <= 1:
+            return None
+
+        batch_size = -(-num_pages // workers)  # ceil division
+        batches = [list(range(start, min(start + batch_size, num_pages)))
+                   for start in range(0, num_pages, batch_size)]
+
+        try:
+            with ProcessPoolExecutor(max_workers=len(batches)) as executor:
+                results = executor.map(
+                    _extract_pages_tables,
+                    [self.pdf_path] * len(batches),
+                    batches,
+                    [self.table_settings] * len(batches)
+                )
+                return [tables for batch in results for tables in batch]
+        except Exception as e:
+            # The pool itself failed (e.g. a broken pool, or workers that cannot be
+            # spawned in a frozen app): extract every page in-process instead
+            logger.warning("Parallel table extraction failed, extracting in-process: %s", e)
+            return None
+
+    def _page_text(self, page) -> str:
+        """
+        Text of a page, extracted once per extraction.
+
+        The totals page is read by several steps (A LIQUIDAR, deductions), and
+        pdfplumber re-tokenizes the page characters on every extract_text call.
+        """
+        text = self._page_text_cache.get(page.page_number)
+        if text is None:
+            text = page.extract_text()
+            self._page_text_cache[page.page_number] = text
+        return text
+
+    def _page_tables(self, page) -> List:
+        """
+        Tables of a page extracted with table_settings, once per extraction.
+
+        The last page is read for the totals and then the refunds, and the
+        second-to-last record page is kept for the totals search; earlier
+        record pages are dropped once read (see extract). Callers must not
+        modify the returned tables.
+        """
+        tables = self._page_tables_cache.get(page.page_number)
+        if tables is None:
+            tables = page.extract_tables(table_settings=self.table_settings)
+            self._page_tables_cache[page.page_number] = tables
+        return tables
+
     def _extract_header(self, page) -> Dict[str, Any]:
         """Extract header information from page 1."""
-        text = page.extract_text()
+        text = self._page_text(page)
         header = {}
 
         # Extract ejercicio (year)
-        match = re.search(r'EJERCICIO\s+(\d{4})', text)
+        match = _RE_EJERCICIO.search(text)
         if match:
             header['ejercicio'] = int(match.group(1))
 
         # Extract mandamiento de pago
-        match = re.search(r'Mandamiento de pago:\s*([\d/]+)', text)
+        match = _RE_MANDAMIENTO.search(text)
         if match:
             header['mandamiento_pago'] = match.group(1)
 
         # Extract fecha mandamiento
-        match = re.search(r'Fecha de mandamiento:\s*(\d{2}/\d{2}/\d{4})', text)
+        match = _RE_FECHA_MANDAMIENTO.search(text)
         if match:
             header['fecha_mandamiento'] = datetime.strptime(match.group(1), '%d/%m/%Y').date()
 
         # Extract numero liquidacion
-        match = re.search(r'Número de liquidación:\s*(\d+)', text)
+        match = _RE_NUMERO_LIQUIDACION.search(text)
         if match:
             header['numero_liquidacion'] = match.group(1)
 
         # Extract entidad
-        match = re.search(r'\((\d+)\)\s+(.+?)(?=\n|$)', text)
+        match = _RE_ENTIDAD.search(text)
         if match:
             header['codigo_entidad'] = match.group(1)
             header['entidad'] = match.group(2).strip()
 
         # Extract verification code
-        match = re.search(r'Código Seguro De Verificación:\s*(\S+)', text)
+        match = _RE_CODIGO_VERIFICACION.search(text)
         if match:
             header['codigo_verificacion'] = match.group(1)
 
         # Extract signature info
-        match = re.search(r'Firmado Por\s+(.+?)(?=\s+Firmado)', text)
+        match = _RE_FIRMADO_POR.search(text)
         if match:
             header['firmado_por'] = match.group(1).strip()
 
-        match = re.search(r'Firmado\s+(\d{2}/\d{2}/\d{4}\s+\d{2}:\d{2}:\d{2})', text)
+        match = _RE_FECHA_FIRMA.search(text)
         if match:
             header['fecha_firma'] = datetime.strptime(match.group(1), '%d/%m/%Y %H:%M:%S')
 
@@ -208,27 +479,29 @@ class LiquidationPDFExtractor:
         This happens when a row is split across pages.
 
         Returns True if row has a concept but all other cells are empty.
+        Expects a normalized row (str cells already stripped, see
+        _extract_tribute_records); a None cell does not count as empty.
         """
         if not row or len(row) < 8:
             return False
 
         # Check if first cell has content but rest are empty
-        first_cell = str(row[0]).strip() if row[0] else ""
+        first_cell = row[0] or ''
         if not first_cell:
             return False
 
         # Skip if it's a header or total row
-        if any(keyword in first_cell.upper() for keyword in ['CONCEPTO', 'CLAVE', 'TOTAL EJERCICIO']):
+        if _RE_HEADER_OR_TOTAL_ROW.search(first_cell):
             return False
 
         # Check if all remaining cells (at least the numeric columns) are empty
         # Columns 3-9 should have numeric data for valid records
         numeric_cells = row[3:10] if len(row) > 9 else row[3:]
-        all_empty = all(not str(cell).strip() or str(cell).strip() == '' for cell in numeric_cells)
+        all_empty = all(cell == '' for cell in numeric_cells)
 
         # Also check clave_contabilidad and clave_recaudacion (columns 1-2)
         clave_cells = row[1:3] if len(row) > 2 else []
-        claves_empty = all(not str(cell).strip() or str(cell).strip() == '' for cell in clave_cells)
+        claves_empty = all(cell == '' for cell in clave_cells)
 
         return all_empty and claves_empty
 
@@ -273,13 +546,53 @@ class LiquidationPDFExtractor:
 
         return merged
 
-    def _extract_tribute_records(self, page) -> Tuple[List[TributeRecord], List[ExerciseSummary]]:
+    def _extract_record_tables(self, page) -> List:
+        """
+        Extract the tables of a record page.
+
+        With reuse_column_lines, the column boundaries of the first record table
+        found are kept and later pages are extracted with them as explicit
+        vertical lines. Explicit lines span the whole page and cut any ruled
+        table (e.g. totals or deductions) into 10 columns, so that result is only
+        kept if it has record rows; otherwise the page falls back to regular
+        detection.
+        """
+        if not self.reuse_column_lines:
+            return self._page_tables(page)
+
+        if self._column_lines is not None:
+            tables = page.extract_tables(table_settings={
+                **self.table_settings,
+                'vertical_strategy': 'explicit',
+                'explicit_vertical_lines': self._column_lines,
+            })
+            if _has_record_rows(tables):
+                return tables
+
+        # Same as page.extract_tables, keeping the Table objects to read their columns
+        found = page.find_tables(table_settings=self.table_settings)
+        if self._column_lines is None:
+            for table in found:
+                column_lines = sorted({x for cell in table.cells for x in (cell[0], cell[2])})
+                if len(column_lines) == _RECORD_TABLE_COLUMN_LINES:
+                    self._column_lines = column_lines
+                    break
+
+        text_settings = TableSettings.resolve(self.table_settings).text_settings or {}
+        return [table.extract(**text_settings) for table in found]
+
+    def _extract_tribute_records(self, page, tables: Optional[List] = None) -> Tuple[List[TributeRecord], List[ExerciseSummary]]:
         """
         Extract tribute records table from page 1.
         This is the most critical extraction - must be highly accurate.
+
+        Args:
+            page: pdfplumber page
+            tables: Tables already extracted from the page (extracted here if None)
         """
         # Extract table using pdfplumber's table detection with custom settings
-        tables = page.extract_tables(table_settings=self.table_settings)
+        if tables is None:
+            tables = self._extract_record_tables(page)
 
         if not tables:
             raise PDFExtractionError("No tables found on this page")
@@ -294,28 +607,32 @@ class LiquidationPDFExtractor:
             if not table or len(table) < 1:
                 continue  # Skip empty tables
 
-            for row in table:
+            # Keep only candidate data rows in one pass over the table: short rows and
+            # header rows are dropped here, so the merge logic below never sees them.
+            # Cells are stripped once here (None is kept as None, inner newlines are
+            # kept for the multi-line splits below) instead of on every check.
+            rows = [
+                [cell.strip() if cell else cell for cell in row]
+                for row in table
+                if row and len(row) >= 8
+                and not _RE_HEADER_ROW.search(str(row[0]))
+            ]
 
-                if not row or len(row) < 8:
-                    continue
-                print(f"DEBUG: [TABLE_{table_idx}]-[ROW] {row}")
+            for row in rows:
+                logger.debug("[TABLE_%d]-[ROW] %s", table_idx, row)
 
                 # Check if we have a pending partial row from previous page
                 if self._pending_partial_row is not None:
-                    # Skip headers on new page
-                    if any(header in str(row[0]).upper() for header in ['CONCEPTO', 'CLAVE']):
-                        continue
-
-                    # Check if current row is a continuation (has data)
+                    # Check if current row is a continuation (has data). Cells are already
+                    # stripped; a missing (None) cell is not empty, as with str(None)
                     numeric_cells = row[3:10] if len(row) >= 10 else row[3:]
-                    has_data = any(str(cell).strip() and str(cell).strip() != ''
-                                   for cell in numeric_cells)
+                    has_data = any(cell != '' for cell in numeric_cells)
 
                     if has_data:
                         # Merge the pending partial row with this continuation row
-                        print(f"DEBUG: Forward merging partial row {self._pending_partial_row[0]} with continuation {row[0]}")
+                        logger.debug("Forward merging partial row %s with continuation %s", self._pending_partial_row[0], row[0])
                         merged_row = self._merge_partial_row(self._pending_partial_row, row)
-                        print(f"DEBUG: Forward merged result: {merged_row}")
+                        logger.debug("Forward merged result: %s", merged_row)
 
                         # Clear the pending partial
                         self._pending_partial_row = None
@@ -324,58 +641,51 @@ class LiquidationPDFExtractor:
                         row = merged_row
                         # Note: last_processed_row will be updated at the end when record is added
                     else:
-                        # This row is also partial or a header, skip it
+                        # This row is also partial, skip it
                         continue
 
-                # Skip header rows
-                if any(header in str(row[0]).upper() for header in ['CONCEPTO', 'CLAVE']):
-                    continue
-
                 # Check if this is a partial row (can be merged backward or forward)
                 if self._is_partial_row(row):
-                    print(f"DEBUG: Found partial row: {row[0]}")
+                    logger.debug("Found partial row: %s", row[0])
 
                     # ALWAYS try backward merging first (merge with last valid data row)
                     # Partial rows are typically continuations of the previous record's concept
                     # This works ACROSS PAGES because self._last_processed_row persists
                     if self._last_processed_row is not None:
-                        print(f"DEBUG: Backward merging with last valid row: {self._last_processed_row[0]}")
+                        logger.debug("Backward merging with last valid row: %s", self._last_processed_row[0])
                         # Merge backward: self._last_processed_row (main concept + data) + row (additional concept text)
                         merged_row = self._merge_partial_row(self._last_processed_row, row)
-                        print(f"DEBUG: Backward merged result: {merged_row}")
+                        logger.debug("Backward merged result: %s", merged_row)
 
                         # Check if this is a cross-page merge (local list is empty)
                         if not tribute_records:
                             # Cross-page merge: signal to remove last record from global list
-                            print(f"DEBUG: Cross-page backward merge detected - will replace last global record")
+                            logger.debug("Cross-page backward merge detected - will replace last global record")
                             self._replace_last_record = True
                         else:
                             # Same-page merge: remove from local list
                             tribute_records.pop()
 
-                        # Process the merged row as a new record
-                        try:
-                            record = self._parse_tribute_row(merged_row, current_exercise)
-                            if record:
-                                tribute_records.append(record)
-                                self._last_processed_row = merged_row
-                                print(f"DEBUG: Added backward-merged record")
-                        except Exception as e:
-                            print(f"Warning: Failed to parse backward-merged row: {e}")
+                        # Process the merged row as a new record. The merged concepto extends
+                        # a valid record's, so None here means the row failed to parse
+                        record = self._parse_tribute_row(merged_row, current_exercise)
+                        if record is not None:
+                            tribute_records.append(record)
+                            self._last_processed_row = merged_row
+                            logger.debug("Added backward-merged record")
+                        else:
+                            logger.warning("Failed to parse backward-merged row")
                             # Re-add the original record if merge failed (only for same-page merges)
                             if tribute_records or not self._replace_last_record:
                                 if self._last_processed_row:
-                                    try:
-                                        record = self._parse_tribute_row(self._last_processed_row, current_exercise)
-                                        if record:
-                                            tribute_records.append(record)
-                                    except:
-                                        pass
+                                    record = self._parse_tribute_row(self._last_processed_row, current_exercise)
+                                    if record:
+                                        tribute_records.append(record)
                             # Clear the flag if merge failed
                             self._replace_last_record = False
                     else:
                         # No previous row to merge with - only at document start
-                        print(f"DEBUG: No previous valid row found, saving for forward merge (cross-page)")
+                        logger.debug("No previous valid row found, saving for forward merge (cross-page)")
                         self._pending_partial_row = row
 
                     continue  # Skip further processing of this partial row
@@ -383,66 +693,42 @@ class LiquidationPDFExtractor:
                 # Check if this row has MULTIPLE RECORDS merged together (not involving TOTAL EJERCICIO)
                 # Example: Two multas records in one row with newlines separating values
                 # Detection: clave_contabilidad (row[1]) has multiple values separated by newlines
-                clave_cont_cell = str(row[1]) if len(row) > 1 and row[1] else ""
-                has_multiple_records = False
-                if '\n' in clave_cont_cell:
-                    # Count number of clave_contabilidad patterns
-                    clave_patterns = re.findall(r'\d{4}/[A-Z]/\d+', clave_cont_cell)
-                    if len(clave_patterns) > 1:
-                        has_multiple_records = True
-
-                if has_multiple_records:
+                clave_cont_cell = row[1] or ""
+                clave_patterns = _RE_CLAVE_CONTABILIDAD.findall(clave_cont_cell) if '\n' in clave_cont_cell else []
+
+                if len(clave_patterns) > 1:
                     # Split this row into multiple separate rows
-                    print(f"DEBUG: Found row with {len(clave_patterns)} merged records")
-
-                    # Determine how many records are merged (by counting newlines in clave_contabilidad)
-                    num_records = len(clave_cont_cell.split('\n'))
-
-                    # Split each cell by newlines
-                    split_cells = []
-                    for cell_idx, cell in enumerate(row):
-                        cell_str = str(cell) if cell else ""
-                        if '\n' in cell_str:
-                            # Special handling for concepto column (index 0)
-                            if cell_idx == 0:
-                                # For concepto, try to intelligently split by finding repeated patterns
-                                # or use the joined text for all records as fallback
-                                lines = cell_str.split('\n')
-                                # If we have lines that look like they repeat, try to group them
-                                # For now, use the complete joined text for all records
-                                full_concepto = ' '.join(lines).strip()
-                                split_cells.append([full_concepto] * num_records)
-                            else:
-                                split_cells.append(cell_str.split('\n'))
-                        else:
-                            # If no newlines, repeat the same value for all records
-                            split_cells.append([cell_str] * num_records)
-
-                    # Create separate rows
-                    for record_idx in range(num_records):
-                        separate_row = []
-                        for cell_values in split_cells:
-                            # Get the value for this record index
-                            if record_idx < len(cell_values):
-                                separate_row.append(cell_values[record_idx])
-                            else:
-                                separate_row.append('')
+                    logger.debug("Found row with %d merged records", len(clave_patterns))
+
+                    # One record per clave_contabilidad found in the cell
+                    num_records = len(clave_patterns)
+
+                    # Split each cell by newlines; a cell without newlines is repeated for
+                    # all records, and the concepto is joined into one line for all of them
+                    concepto = ' '.join((row[0] or '').split('\n')).strip()
+                    split_cells = [[concepto] * num_records]
+                    split_cells.extend(
+                        cell.split('\n') if cell and '\n' in cell else [cell or ''] * num_records
+                        for cell in row[1:]
+                    )
+
+                    # Transpose into one row per record, padding cells with fewer lines
+                    separate_rows = islice(zip_longest(*split_cells, fillvalue=''), num_records)
+                    for record_idx, values in enumerate(separate_rows):
+                        separate_row = list(values)
 
                         # Process this separate row as a normal tribute record
-                        try:
-                            record = self._parse_tribute_row(separate_row, current_exercise)
-                            if record:
-                                tribute_records.append(record)
-                                self._last_processed_row = separate_row  # Track last processed row
-                                print(f"  - Created record {record_idx + 1}: {record.clave_contabilidad}")
-                        except Exception as e:
-                            print(f"Warning: Failed to parse split record {record_idx + 1}: {e}")
+                        record = self._parse_tribute_row(separate_row, current_exercise)
+                        if record:
+                            tribute_records.append(record)
+                            self._last_processed_row = separate_row  # Track last processed row
+                            logger.debug("  - Created record %d: %s", record_idx + 1, record.clave_contabilidad)
 
                     continue  # Skip further processing for this row
 
                 # Check if this row has BOTH record data AND "TOTAL EJERCICIO" merged (PDF formatting issue)
                 # Example: "MULTAS 2025/M/0000731\nTRAFICO/CIR\nCULACION\nTOTAL EJERCICIO"
-                concepto_text = str(row[0]) if row[0] else ""
+                concepto_text = row[0] or ""
                 is_merged_row = (
                     '\n' in concepto_text and
                     'TOTAL' in concepto_text.upper() and
@@ -465,9 +751,9 @@ class LiquidationPDFExtractor:
                     if row[1] is None or not row[1]:
                         # Look for pattern like "2025/M/0000731" in first line
                         first_line = concepto_lines[0] if concepto_lines else ""
-                        match = re.search(r'(\d{4}/[A-Z]/\d+)', first_line)
+                        match = _RE_CLAVE_CONTABILIDAD.search(first_line)
                         if match:
-                            clave_contabilidad_extracted = match.group(1)
+                            clave_contabilidad_extracted = match.group(0)
                             # Remove it from concepto
                             concepto_lines[0] = first_line.replace(clave_contabilidad_extracted, '').strip()
 
@@ -485,72 +771,62 @@ class LiquidationPDFExtractor:
                         if idx == 1 and clave_contabilidad_extracted:
                             record_row.append(clave_contabilidad_extracted)
                             total_row.append('')
-                        elif cell and '\n' in str(cell):
-                            lines = str(cell).split('\n')
+                        elif cell and '\n' in cell:
+                            lines = cell.split('\n')
                             # For other columns, first value is record, second is total
                             record_row.append(lines[0] if len(lines) > 0 else '')
                             total_row.append(lines[1] if len(lines) > 1 else '')
                         else:
-                            record_row.append(str(cell) if cell else '')
+                            record_row.append(cell or '')
                             total_row.append('')
 
                     # Process the record first
-                    try:
-                        record = self._parse_tribute_row(record_row, current_exercise)
-                        if record:
-                            tribute_records.append(record)
-                            self._last_processed_row = record_row  # Track last processed row
-                    except Exception as e:
-                        print(f"Warning: Failed to parse merged record row {record_row}: {e}")
+                    record = self._parse_tribute_row(record_row, current_exercise)
+                    if record:
+                        tribute_records.append(record)
+                        self._last_processed_row = record_row  # Track last processed row
 
                     # Then process the total
                     if any(total_row):
-                        match = re.search(r'(\d{4})', total_row[2] if len(total_row) > 2 else total_row[0])
+                        match = _RE_YEAR.search(total_row[2] if len(total_row) > 2 else total_row[0])
                         if match:
                             year = int(match.group(1))
-                            try:
-                                summary = self._parse_summary_row(total_row, year)
+                            summary = self._parse_summary_row(total_row, year)
+                            if summary is not None:
                                 exercise_summaries.append(summary)
                                 current_exercise = year
-                            except Exception as e:
-                                print(f"Warning: Failed to parse merged total row for year {year}: {e}")
                     continue
 
                 # Check if this is a regular TOTAL row (exercise summary)
-                if 'TOTAL' in str(row[0]).upper() and 'EJERCICIO' in str(row[0]).upper():
+                first_cell_upper = (row[0] or '').upper()
+                if 'TOTAL' in first_cell_upper and 'EJERCICIO' in first_cell_upper:
                     # Extract year - try row[2] first (where year usually is), then row[1], then row[0]
                     year_candidates = []
                     if len(row) > 2 and row[2]:
-                        year_candidates.append(str(row[2]))
+                        year_candidates.append(row[2])
                     if len(row) > 1 and row[1]:
-                        year_candidates.append(str(row[1]))
-                    year_candidates.append(str(row[0]))
+                        year_candidates.append(row[1])
+                    year_candidates.append(row[0] or '')
 
                     match = None
                     for candidate in year_candidates:
-                        match = re.search(r'(\d{4})', candidate)
+                        match = _RE_YEAR.search(candidate)
                         if match:
                             break
 
                     if match:
                         year = int(match.group(1))
-                        try:
-                            summary = self._parse_summary_row(row, year)
+                        summary = self._parse_summary_row(row, year)
+                        if summary is not None:
                             exercise_summaries.append(summary)
                             current_exercise = year
-                        except Exception as e:
-                            print(f"Warning: Failed to parse summary row for year {year}: {e}")
                     continue
 
                 # Parse regular tribute record
-                try:
-                    record = self._parse_tribute_row(row, current_exercise)
-                    if record:
-                        tribute_records.append(record)
-                        self._last_processed_row = row  # Track for potential backward merging
-                except Exception as e:
-                    print(f"Warning: Failed to parse row {row}: {e}")
-                    continue
+                record = self._parse_tribute_row(row, current_exercise)
+                if record:
+                    tribute_records.append(record)
+                    self._last_processed_row = row  # Track for potential backward merging
 
         return tribute_records, exercise_summaries
 
@@ -561,102 +837,115 @@ class LiquidationPDFExtractor:
         Expected columns:
         [CONCEPTO, CLAVE_CONTABILIDAD, CLAVE_RECAUDACION, VOLUNTARIA, EJECUTIVA,
          RECARGO, DIP_VOLUNTARIA, DIP_EJECUTIVA, DIP_RECARGO, LIQUIDO]
+
+        Returns None for rows that are not records and for rows that fail to
+        parse (logged), so callers need no exception handling per row.
         """
         if len(row) < 10:
             return None
 
-        # Clean and parse values - remove newlines and extra spaces
-        concepto = str(row[0]).strip() if row[0] else ""
-        # Replace newlines and multiple spaces with single space
-        concepto = re.sub(r'\s+', ' ', concepto)
-        if not concepto or concepto.upper() in ['CONCEPTO', 'TOTAL']:
-            return None
-
-        clave_contabilidad = str(row[1]).strip() if row[1] else ""
-        clave_recaudacion = str(row[2]).strip() if row[2] else ""
-
-        # Parse amounts - handle thousands separators and decimals
-        voluntaria = self._parse_amount(row[3])
-        ejecutiva = self._parse_amount(row[4])
-        recargo = self._parse_amount(row[5])
-        dip_voluntaria = self._parse_amount(row[6])
-        dip_ejecutiva = self._parse_amount(row[7])
-        dip_recargo = self._parse_amount(row[8])
-        liquido = self._parse_amount(row[9])
-
-        # Extract ejercicio (fiscal year) from clave_recaudacion
-        # Format: 026/YYYY/xx/xxx/xxx where YYYY is the fiscal year
-        # ALWAYS extract from clave_recaudacion first (most reliable source)
-        extracted_ejercicio = None
-        if clave_recaudacion:
-            # Try to match the format 026/YYYY/...
-            match = re.search(r'026/(\d{4})/', clave_recaudacion)
-            if match:
-                extracted_ejercicio = int(match.group(1))
-            else:
-                # Fallback: try any 4-digit year in clave_recaudacion
-                match = re.search(r'(\d{4})', clave_recaudacion)
+        try:
+            # Clean and parse values - remove newlines and extra spaces
+            concepto = str(row[0]).strip() if row[0] else ""
+            # Replace newlines and multiple spaces with single space
+            concepto = _RE_WHITESPACE.sub(' ', concepto)
+            if not concepto or concepto.upper() in ['CONCEPTO', 'TOTAL']:
+                return None
+
+            clave_contabilidad = str(row[1]).strip() if row[1] else ""
+            clave_recaudacion = str(row[2]).strip() if row[2] else ""
+
+            # Parse amounts - handle thousands separators and decimals
+            voluntaria = self._parse_amount(row[3])
+            ejecutiva = self._parse_amount(row[4])
+            recargo = self._parse_amount(row[5])
+            dip_voluntaria = self._parse_amount(row[6])
+            dip_ejecutiva = self._parse_amount(row[7])
+            dip_recargo = self._parse_amount(row[8])
+            liquido = self._parse_amount(row[9])
+
+            # Extract ejercicio (fiscal year) from clave_recaudacion
+            # Format: 026/YYYY/xx/xxx/xxx where YYYY is the fiscal year
+            # ALWAYS extract from clave_recaudacion first (most reliable source)
+            extracted_ejercicio = None
+            if clave_recaudacion:
+                # Try to match the format 026/YYYY/..., falling back to any 4-digit year
+                match = _RE_CLAVE_RECAUDACION_YEAR.match(clave_recaudacion)
+                if match:
+                    if match.group(1):
+                        extracted_ejercicio = int(match.group(1))
+                    else:
+                        year = int(match.group(2))
+                        # Validate it's a reasonable year (2000-2030)
+                        if 2000 <= year <= 2030:
+                            extracted_ejercicio = year
+
+            # If not found in clave_recaudacion, try clave_contabilidad
+            if not extracted_ejercicio and clave_contabilidad:
+                match = _RE_YEAR.search(clave_contabilidad)
                 if match:
                     year = int(match.group(1))
-                    # Validate it's a reasonable year (2000-2030)
                     if 2000 <= year <= 2030:
                         extracted_ejercicio = year
 
-        # If not found in clave_recaudacion, try clave_contabilidad
-        if not extracted_ejercicio and clave_contabilidad:
-            match = re.search(r'(\d{4})', clave_contabilidad)
-            if match:
-                year = int(match.group(1))
-                if 2000 <= year <= 2030:
-                    extracted_ejercicio = year
-
-        # Use extracted year, fall back to parameter, then to default
-        if extracted_ejercicio:
-            ejercicio = extracted_ejercicio
-        elif not ejercicio:
-            ejercicio = 2025  # Default fallback
-
-        return TributeRecord(
-            concepto=concepto,
-            clave_contabilidad=clave_contabilidad,
-            clave_recaudacion=clave_recaudacion,
-            voluntaria=voluntaria,
-            ejecutiva=ejecutiva,
-            recargo=recargo,
-            diputacion_voluntaria=dip_voluntaria,
-            diputacion_ejecutiva=dip_ejecutiva,
-            diputacion_recargo=dip_recargo,
-            liquido=liquido,
-            ejercicio=ejercicio
-        )
-
-    def _parse_summary_row(self, row: List[str], ejercicio: int) -> ExerciseSummary:
-        """Parse a TOTAL EJERCICIO summary row."""
-        # Similar structure to tribute row but for totals
-        voluntaria = self._parse_amount(row[3]) if len(row) > 3 else Decimal('0')
-        ejecutiva = self._parse_amount(row[4]) if len(row) > 4 else Decimal('0')
-        recargo = self._parse_amount(row[5]) if len(row) > 5 else Decimal('0')
-        dip_voluntaria = self._parse_amount(row[6]) if len(row) > 6 else Decimal('0')
-        dip_ejecutiva = self._parse_amount(row[7]) if len(row) > 7 else Decimal('0')
-        dip_recargo = self._parse_amount(row[8]) if len(row) > 8 else Decimal('0')
-        liquido = self._parse_amount(row[9]) if len(row) > 9 else Decimal('0')
-
-        return ExerciseSummary(
-            ejercicio=ejercicio,
-            voluntaria=voluntaria,
-            ejecutiva=ejecutiva,
-            recargo=recargo,
-            diputacion_voluntaria=dip_voluntaria,
-            diputacion_ejecutiva=dip_ejecutiva,
-            diputacion_recargo=dip_recargo,
-            liquido=liquido
-        )
+            # Use extracted year, fall back to parameter, then to default
+            if extracted_ejercicio:
+                ejercicio = extracted_ejercicio
+            elif not ejercicio:
+                ejercicio = 2025  # Default fallback
+
+            return TributeRecord(
+                concepto=concepto,
+                clave_contabilidad=clave_contabilidad,
+                clave_recaudacion=clave_recaudacion,
+                voluntaria=voluntaria,
+                ejecutiva=ejecutiva,
+                recargo=recargo,
+                diputacion_voluntaria=dip_voluntaria,
+                diputacion_ejecutiva=dip_ejecutiva,
+                diputacion_recargo=dip_recargo,
+                liquido=liquido,
+                ejercicio=ejercicio
+            )
+        except Exception as e:
+            logger.warning("Failed to parse row %s: %s", row, e)
+            return None
+
+    def _parse_summary_row(self, row: List[str], ejercicio: int) -> Optional[ExerciseSummary]:
+        """Parse a TOTAL EJERCICIO summary row (None, logged, if it fails to parse)."""
+        try:
+            # Similar structure to tribute row but for totals
+            voluntaria = self._parse_amount(row[3]) if len(row) > 3 else Decimal('0')
+            ejecutiva = self._parse_amount(row[4]) if len(row) > 4 else Decimal('0')
+            recargo = self._parse_amount(row[5]) if len(row) > 5 else Decimal('0')
+            dip_voluntaria = self._parse_amount(row[6]) if len(row) > 6 else Decimal('0')
+            dip_ejecutiva = self._parse_amount(row[7]) if len(row) > 7 else Decimal('0')
+            dip_recargo = self._parse_amount(row[8]) if len(row) > 8 else Decimal('0')
+            liquido = self._parse_amount(row[9]) if len(row) > 9 else Decimal('0')
+
+            return ExerciseSummary(
+                ejercicio=ejercicio,
+                voluntaria=voluntaria,
+                ejecutiva=ejecutiva,
+                recargo=recargo,
+                diputacion_voluntaria=dip_voluntaria,
+                diputacion_ejecutiva=dip_ejecutiva,
+                diputacion_recargo=dip_recargo,
+                liquido=liquido
+            )
+        except Exception as e:
+            logger.warning("Failed to parse summary row for year %d: %s", ejercicio, e)
+            return None
 
     def _find_and_extract_totals(self, pages) -> Tuple[Dict[str, Decimal], DeductionDetail, List[AdvanceBreakdown]]:
         """
         Find and extract totals by searching for TOTAL table structure across ALL pages.
         This is more robust than hardcoded page numbers.
 
+        Pages are searched from the last one backwards, since the TOTAL table
+        sits at the end of the document; the common case extracts the tables
+        of a single page.
+
         Returns:
             Tuple of (totals dict, deductions, advance_breakdown)
         """
@@ -673,9 +962,10 @@ class LiquidationPDFExtractor:
         deductions = None
         advance_breakdown = []
 
-        # Search all pages for the TOTAL table
-        for page_idx, page in enumerate(pages):
-            tables = page.extract_tables(table_settings=self.table_settings)
+        # Search all pages for the TOTAL table, last page first
+        for page_idx in reversed(range(len(pages))):
+            page = pages[page_idx]
+            tables = self._page_tables(page)
 
             # Look for TOTAL table by structure
             for table in tables:
@@ -705,7 +995,7 @@ class LiquidationPDFExtractor:
                     continue
 
                 # Found the TOTAL table! Extract values from multi-line cell
-                print(f"DEBUG: Found TOTAL table on page {page_idx + 1}")
+                logger.debug("Found TOTAL table on page %d", page_idx + 1)
                 lines = multiline_cell.split('\n')
 
                 for line in lines:
@@ -713,74 +1003,64 @@ class LiquidationPDFExtractor:
                     if not line:
                         continue
 
-                    # Match VOLUNTARIA (not DIPUTACIÓN VOLUNTARIA)
-                    if line.startswith('VOLUNTARIA'):
-                        match = re.search(r'VOLUNTARIA\s+([\d.,]+)', line)
-                        if match:
-                            totals['voluntaria'] = self._parse_amount(match.group(1))
-
-                    # Match EJECUTIVA (not DIPUTACIÓN EJECUTIVA)
-                    elif line.startswith('EJECUTIVA'):
-                        match = re.search(r'EJECUTIVA\s+([\d.,]+)', line)
-                        if match:
-                            totals['ejecutiva'] = self._parse_amount(match.group(1))
-
-                    # Match RECARGO (not DIPUTACIÓN RECARGO)
-                    elif line.startswith('RECARGO'):
-                        match = re.search(r'RECARGO\s+([\d.,]+)', line)
-                        if match:
-                            totals['recargo'] = self._parse_amount(match.group(1))
-
-                    # Match DIPUTACIÓN VOLUNTARIA
-                    elif 'DIPUTACI' in line.upper() and 'VOLUNTARIA' in line:
-                        match = re.search(r'VOLUNTARIA\s+([\d.,]+)', line)
-                        if match:
-                            totals['diputacion_voluntaria'] = self._parse_amount(match.group(1))
-
-                    # Match DIPUTACIÓN EJECUTIVA
-                    elif 'DIPUTACI' in line.upper() and 'EJECUTIVA' in line:
-                        match = re.search(r'EJECUTIVA\s+([\d.,]+)', line)
-                        if match:
-                            totals['diputacion_ejecutiva'] = self._parse_amount(match.group(1))
-
-                    # Match DIPUTACIÓN RECARGO
-                    elif 'DIPUTACI' in line.upper() and 'RECARGO' in line:
-                        match = re.search(r'RECARGO\s+([\d.,]+)', line)
-                        if match:
-                            totals['diputacion_recargo'] = self._parse_amount(match.group(1))
+                    # VOLUNTARIA, EJECUTIVA, RECARGO and their DIPUTACIÓN counterparts
+                    self._parse_total_line(line, totals)
 
                 # Check row 2 or next rows for LÍQUIDO
                 for row in table[2:]:
                     for cell in row:
-                        if cell and re.search(r'L[IÍ]QUIDO', str(cell), re.IGNORECASE):
-                            match = re.search(r'L[IÍ]QUIDO\s+([\d.,]+)', str(cell), re.IGNORECASE)
+                        if cell and _RE_LIQUIDO_LABEL.search(str(cell)):
+                            match = _RE_LIQUIDO.search(str(cell))
                             if match:
                                 totals['liquido'] = self._parse_amount(match.group(1))
                                 break
 
                 # Extract A LIQUIDAR from the same page
-                page_text = page.extract_text()
-                match = re.search(r'A\s+LIQUIDAR\s+([\d.,]+)', page_text)
+                page_text = self._page_text(page)
+                match = _RE_A_LIQUIDAR.search(page_text)
                 if match:
                     totals['a_liquidar'] = self._parse_amount(match.group(1))
 
                 # Extract deductions and advance breakdown from the same page
                 try:
-                    _, deductions, advance_breakdown = self._extract_page2_data(page)
+                    _, deductions, advance_breakdown = self._extract_page2_data(page, tables)
                 except Exception as e:
-                    print(f"Warning: Failed to extract deductions from page {page_idx + 1}: {e}")
+                    logger.warning("Failed to extract deductions from page %d: %s", page_idx + 1, e)
 
                 # Successfully found and extracted totals, return immediately
                 return totals, deductions, advance_breakdown
 
         # If we didn't find TOTAL table, return defaults
-        print("Warning: TOTAL table not found in any page")
+        logger.warning("TOTAL table not found in any page")
         return totals, deductions, advance_breakdown
 
-    def _extract_page2_data(self, page) -> Tuple[Dict[str, Decimal], DeductionDetail, List[AdvanceBreakdown]]:
-        """Extract totals, deductions, and advance breakdown from page 2."""
-        text = page.extract_text()
-        tables = page.extract_tables(table_settings=self.table_settings)
+    def _parse_total_line(self, line: str, totals: Dict[str, Decimal]) -> bool:
+        """
+        Store the amount of a line of the TOTAL table cell in totals.
+
+        Returns False if the line is not a VOLUNTARIA, EJECUTIVA or RECARGO line
+        (plain or DIPUTACIÓN); a labelled line without an amount returns True.
+        """
+        label = _RE_TOTAL_LINE_LABEL.match(line)
+        if not label:
+            return False
+
+        match = _TOTAL_LINE_AMOUNTS[label.lastgroup].search(line)
+        if match:
+            totals[label.lastgroup] = self._parse_amount(match.group(1))
+        return True
+
+    def _extract_page2_data(self, page, tables: Optional[List] = None) -> Tuple[Dict[str, Decimal], DeductionDetail, List[AdvanceBreakdown]]:
+        """
+        Extract totals, deductions, and advance breakdown from page 2.
+
+        Args:
+            page: pdfplumber page
+            tables: Tables already extracted from the page (extracted here if None)
+        """
+        text = self._page_text(page)
+        if tables is None:
+            tables = self._page_tables(page)
 
         # Extract TOTAL section from tables first (more reliable)
         totals = {
@@ -797,11 +1077,9 @@ class LiquidationPDFExtractor:
         # Try to find TOTAL table (usually the first table on last page)
         for idx, table in enumerate(tables):
             if table and len(table) > 0:
-                # Check if this is the totals table
-                table_text = ' '.join([' '.join([str(cell) for cell in row if cell]) for row in table])
-                # Check for LÍQUIDO with or without accent
-                has_liquido = 'LIQUIDO' in table_text.upper() or 'LÍQUIDO' in table_text.upper() or 'L�QUIDO' in table_text.upper()
-                if 'VOLUNTARIA' in table_text and 'EJECUTIVA' in table_text and has_liquido:
+                # Check if this is the totals table (LÍQUIDO with or without accent)
+                if (_table_has_tokens(table, ('VOLUNTARIA', 'EJECUTIVA'))
+                        and _table_has_tokens(table, (_LIQUIDO_SPELLINGS,), ignore_case=True)):
                     # Parse totals from this table
                     # The totals are often in a single cell with newlines, so we need to split
                     for row_idx, row in enumerate(table):
@@ -821,50 +1099,17 @@ class LiquidationPDFExtractor:
                                     continue
 
 
-                                # Match VOLUNTARIA (not DIPUTACIÓN VOLUNTARIA)
-                                if line.startswith('VOLUNTARIA'):
-                                    match = re.search(r'VOLUNTARIA\s+([\d.,]+)', line)
-                                    if match:
-                                        totals['voluntaria'] = self._parse_amount(match.group(1))
-
-                                # Match EJECUTIVA (not DIPUTACIÓN EJECUTIVA or TASA EJECUTIVA)
-                                elif line.startswith('EJECUTIVA'):
-                                    match = re.search(r'EJECUTIVA\s+([\d.,]+)', line)
-                                    if match:
-                                        totals['ejecutiva'] = self._parse_amount(match.group(1))
-
-                                # Match RECARGO (not DIPUTACIÓN RECARGO)
-                                elif line.startswith('RECARGO'):
-                                    match = re.search(r'RECARGO\s+([\d.,]+)', line)
-                                    if match:
-                                        totals['recargo'] = self._parse_amount(match.group(1))
-
-                                # Match DIPUTACIÓN VOLUNTARIA
-                                elif 'DIPUTACI' in line.upper() and 'VOLUNTARIA' in line:
-                                    match = re.search(r'VOLUNTARIA\s+([\d.,]+)', line)
-                                    if match:
-                                        totals['diputacion_voluntaria'] = self._parse_amount(match.group(1))
-
-                                # Match DIPUTACIÓN EJECUTIVA
-                                elif 'DIPUTACI' in line.upper() and 'EJECUTIVA' in line:
-                                    match = re.search(r'EJECUTIVA\s+([\d.,]+)', line)
-                                    if match:
-                                        totals['diputacion_ejecutiva'] = self._parse_amount(match.group(1))
-
-                                # Match DIPUTACIÓN RECARGO
-                                elif 'DIPUTACI' in line.upper() and 'RECARGO' in line:
-                                    match = re.search(r'RECARGO\s+([\d.,]+)', line)
-                                    if match:
-                                        totals['diputacion_recargo'] = self._parse_amount(match.group(1))
-
-                                # Match LÍQUIDO
-                                elif re.search(r'L[IÍ]QUIDO', line, re.IGNORECASE):
-                                    match = re.search(r'L[IÍ]QUIDO\s+([\d.,]+)', line, re.IGNORECASE)
+                                # VOLUNTARIA, EJECUTIVA, RECARGO and their DIPUTACIÓN counterparts,
+                                # else LÍQUIDO
+                                if self._parse_total_line(line, totals):
+                                    continue
+                                if _RE_LIQUIDO_LABEL.search(line):
+                                    match = _RE_LIQUIDO.search(line)
                                     if match:
                                         totals['liquido'] = self._parse_amount(match.group(1))
 
         # Extract A LIQUIDAR from text
-        match = re.search(r'A\s+LIQUIDAR\s+([\d.,]+)', text)
+        match = _RE_A_LIQUIDAR.search(text)
         if match:
             totals['a_liquidar'] = self._parse_amount(match.group(1))
 
@@ -878,8 +1123,7 @@ class LiquidationPDFExtractor:
                 continue
 
             # Check if this is the deductions table
-            table_text = ' '.join([str(cell) for row in table for cell in row if cell])
-            if 'DEDUCCIONES' in table_text.upper() and 'RECAUDACIÓN' in table_text.upper():
+            if _table_has_tokens(table, ('DEDUCCIONES', 'RECAUDACIÓN'), ignore_case=True):
                 # Found the deductions table - look for multiline cells
                 for row in table:
                     for cell in row:
@@ -898,123 +1142,106 @@ class LiquidationPDFExtractor:
 
                                 # RECAUDACIÓN section
                                 if '- TASA VOLUNTARIA' in line:
-                                    match = re.search(r'TASA VOLUNTARIA\s+([\d.,]+)', line)
+                                    match = _RE_TASA_VOLUNTARIA.search(line)
                                     if match:
                                         deductions.tasa_voluntaria = self._parse_amount(match.group(1))
                                         deductions_found = True
                                 elif '- TASA EJECUTIVA SIN RECARGO' in line:
-                                    match = re.search(r'SIN RECARGO\s+([\d.,]+)', line)
+                                    match = _RE_SIN_RECARGO.search(line)
                                     if match:
                                         deductions.tasa_ejecutiva_sin_recargo = self._parse_amount(match.group(1))
                                         deductions_found = True
                                 elif '- TASA EJECUTIVA' in line:
-                                    match = re.search(r'TASA EJECUTIVA\s+([\d.,]+)', line)
+                                    match = _RE_TASA_EJECUTIVA.search(line)
                                     if match:
                                         deductions.tasa_ejecutiva = self._parse_amount(match.group(1))
                                         deductions_found = True
                                 elif '- TASA BAJA' in line or 'ÓRGANO GESTOR' in line:
-                                    match = re.search(r'([\d.,]+)', line)
+                                    match = _RE_AMOUNT.search(line)
                                     if match:
                                         deductions.tasa_baja_organo_gestor_deleg = self._parse_amount(match.group(1))
                                         deductions_found = True
 
                                 # TRIBUTARIA section
                                 elif '- TASA GESTIÓN TRIBUTARIA' in line or '- TASA GESTION TRIBUTARIA' in line:
-                                    match = re.search(r'TRIBUTARIA\s+([\d.,]+)', line)
+                                    match = _RE_TRIBUTARIA.search(line)
                                     if match:
                                         deductions.tasa_gestion_tributaria = self._parse_amount(match.group(1))
                                         deductions_found = True
                                 elif '- TASA GESTIÓN CENSAL' in line or '- TASA GESTION CENSAL' in line:
-                                    match = re.search(r'CENSAL\s+([\d.,]+)', line)
+                                    match = _RE_CENSAL.search(line)
                                     if match:
                                         deductions.tasa_gestion_censal = self._parse_amount(match.group(1))
                                         deductions_found = True
                                 elif '- TASA GESTIÓN CATASTRAL' in line or '- TASA GESTION CATASTRAL' in line:
-                                    match = re.search(r'CATASTRAL\s+([\d.,]+)', line)
+                                    match = _RE_CATASTRAL.search(line)
                                     if match:
                                         deductions.tasa_gestion_catastral = self._parse_amount(match.group(1))
                                         deductions_found = True
 
                                 # MULTAS/SANCIONES section
                                 elif '- TASA SANCIÓN TRIBUTARIA' in line or '- TASA SANCION TRIBUTARIA' in line:
-                                    match = re.search(r'TRIBUTARIA\s+([\d.,]+)', line)
+                                    match = _RE_TRIBUTARIA.search(line)
                                     if match:
                                         deductions.tasa_sancion_tributaria = self._parse_amount(match.group(1))
                                         deductions_found = True
                                 elif '- TASA SANCIÓN RECAUDACIÓN' in line or '- TASA SANCION RECAUDACION' in line:
-                                    match = re.search(r'RECAUDACIÓN\s+([\d.,]+)', line)
+                                    match = _RE_RECAUDACION.search(line)
                                     if match:
                                         deductions.tasa_sancion_recaudacion = self._parse_amount(match.group(1))
                                         deductions_found = True
                                 elif '- TASA SANCIÓN INSPECCIÓN' in line or '- TASA SANCION INSPECCION' in line:
-                                    match = re.search(r'INSPECCIÓN\s+([\d.,]+)', line)
+                                    match = _RE_INSPECCION.search(line)
                                     if match:
                                         deductions.tasa_sancion_inspeccion = self._parse_amount(match.group(1))
                                         deductions_found = True
                                 elif '- TASA MULTAS DE TRÁFICO' in line or '- TASA MULTAS DE TRAFICO' in line:
-                                    match = re.search(r'TRÁFICO\s+([\d.,]+)', line)
+                                    match = _RE_TRAFICO.search(line)
                                     if not match:
-                                        match = re.search(r'TRAFICO\s+([\d.,]+)', line)
+                                        match = _RE_TRAFICO_UNACCENTED.search(line)
                                     if match:
                                         deductions.tasa_multas_trafico = self._parse_amount(match.group(1))
                                         deductions_found = True
 
                                 # OTRAS DEDUCCIONES section
                                 elif '- GASTOS REPERCUTIDOS' in line:
-                                    match = re.search(r'REPERCUTIDOS\s+([\d.,]+)', line)
+                                    match = _RE_REPERCUTIDOS.search(line)
                                     if match:
                                         deductions.gastos_repercutidos = self._parse_amount(match.group(1))
                                         deductions_found = True
                                 elif '- ANTICIPOS' in line:
-                                    match = re.search(r'ANTICIPOS\s+([\d.,]+)', line)
+                                    match = _RE_ANTICIPOS.search(line)
                                     if match:
                                         deductions.anticipos = self._parse_amount(match.group(1))
                                         deductions_found = True
                                 elif '- INTERESES POR ANTICIPO' in line:
-                                    match = re.search(r'ANTICIPO\s+([\d.,]+)', line)
+                                    match = _RE_ANTICIPO.search(line)
                                     if match:
                                         deductions.intereses_por_anticipo = self._parse_amount(match.group(1))
                                         deductions_found = True
                                 elif 'EXPEDIENTES COMPENSACIÓN' in line or 'EXPEDIENTES COMPENSACION' in line:
-                                    match = re.search(r'([\d.,]+)$', line)
+                                    match = _RE_TRAILING_AMOUNT.search(line)
                                     if match:
                                         # Sum both ENTIDAD and TRIBUTARIA into expedientes_compensacion
                                         current = deductions.expedientes_compensacion
                                         deductions.expedientes_compensacion = current + self._parse_amount(match.group(1))
                                         deductions_found = True
                                 elif '- EXPEDIENTES INGRESOS INDEBIDOS' in line:
-                                    match = re.search(r'INDEBIDOS\s+([\d.,]+)', line)
+                                    match = _RE_INDEBIDOS.search(line)
                                     if match:
                                         deductions.expedientes_ingresos_indebidos = self._parse_amount(match.group(1))
                                         deductions_found = True
 
         # Fallback: If table parsing didn't work, try regex on full text
         if not deductions_found:
-            deduction_patterns = {
-                'tasa_voluntaria': r'-?\s*TASA VOLUNTARIA\s+([\d.,]+)',
-                'tasa_ejecutiva': r'-?\s*TASA EJECUTIVA(?!\s+SIN)\s+([\d.,]+)',
-                'tasa_ejecutiva_sin_recargo': r'-?\s*TASA EJECUTIVA SIN RECARGO\s+([\d.,]+)',
-                'tasa_gestion_censal': r'-?\s*TASA GESTIÓN CENSAL\s+([\d.,]+)',
-                'tasa_gestion_catastral': r'-?\s*TASA GESTIÓN CATASTRAL\s+([\d.,]+)',
-                'tasa_gestion_tributaria': r'-?\s*TASA GESTIÓN TRIBUTARIA\s+([\d.,]+)',
-                'tasa_multas_trafico': r'-?\s*TASA MULTAS DE TRÁFICO\s+([\d.,]+)',
-                'tasa_sancion_tributaria': r'-?\s*TASA SANCIÓN TRIBUTARIA\s+([\d.,]+)',
-                'tasa_sancion_recaudacion': r'-?\s*TASA SANCIÓN RECAUDACIÓN\s+([\d.,]+)',
-                'tasa_sancion_inspeccion': r'-?\s*TASA SANCIÓN INSPECCIÓN\s+([\d.,]+)',
-                'gastos_repercutidos': r'-?\s*GASTOS REPERCUTIDOS\s+([\d.,]+)',
-                'anticipos': r'-?\s*ANTICIPOS\s+([\d.,]+)',
-                'intereses_por_anticipo': r'-?\s*INTERESES POR ANTICIPO\s+([\d.,]+)',
-                'expedientes_ingresos_indebidos': r'-?\s*EXPEDIENTES INGRESOS INDEBIDOS\s+([\d.,]+)',
-            }
-
-            for field, pattern in deduction_patterns.items():
-                match = re.search(pattern, text)
+
+            for field, pattern in _DEDUCTION_TEXT_PATTERNS.items():
+                match = pattern.search(text)
                 if match:
                     setattr(deductions, field, self._parse_amount(match.group(1)))
 
         # Extract advance breakdown table
         advance_breakdown = []
-        tables = page.extract_tables(table_settings=self.table_settings)
         for table in tables:
             for row in table:
                 if row and len(row) >= 8 and str(row[0]).isdigit():
@@ -1040,7 +1267,7 @@ class LiquidationPDFExtractor:
         refund_records = []
         refund_summaries = []
 
-        tables = page.extract_tables(table_settings=self.table_settings)
+        tables = self._page_tables(page)
 
         for table in tables:
             for row in table:
@@ -1052,7 +1279,7 @@ class LiquidationPDFExtractor:
                     continue
 
                 # Check if this is a refund record row (has expediente number)
-                if re.match(r'\d{4}/\d+', str(row[0])):
+                if _RE_EXPTE.match(str(row[0])):
                     try:
                         record = RefundRecord(
                             num_expte=str(row[0]),
@@ -1067,7 +1294,7 @@ class LiquidationPDFExtractor:
                         )
                         refund_records.append(record)
                     except Exception as e:
-                        print(f"Warning: Failed to parse refund record {row}: {e}")
+                        logger.warning("Failed to parse refund record %s: %s", row, e)
                         continue
 
                 # Check if this is a concept summary row
@@ -1090,6 +1317,9 @@ class LiquidationPDFExtractor:
         """
         Parse amount from string, handling various formats.
 
+        Results for string cells are memoized per extractor: Decimal is
+        immutable, so the same instance can be shared by every record.
+
         Examples:
             "1.234,56" -> Decimal("1234.56")
             "1234.56" -> Decimal("1234.56")
@@ -1098,6 +1328,17 @@ class LiquidationPDFExtractor:
         if value is None or value == '':
             return Decimal('0')
 
+        if isinstance(value, str):
+            amount = self._amount_cache.get(value)
+            if amount is None:
+                amount = self._parse_amount_text(value)
+                self._amount_cache[value] = amount
+            return amount
+
+        return self._parse_amount_text(value)
+
+    def _parse_amount_text(self, value: Any) -> Decimal:
+        """Parse a non-empty amount value (uncached, see _parse_amount)."""
         # Convert to string and clean
         value_str = str(value).strip()
 
@@ -1117,13 +1358,13 @@ class LiquidationPDFExtractor:
             # The one that comes last is the decimal separator
             if comma_pos > dot_pos:
                 # European: 1.234,56
-                value_str = value_str.replace('.', '').replace(',', '.')
+                value_str = value_str.translate(_EUROPEAN_AMOUNT_TABLE)
             else:
                 # American: 1,234.56
                 value_str = value_str.replace(',', '')
         elif ',' in value_str:
             # Only comma - assume European format
-            value_str = value_str.replace('.', '').replace(',', '.')
+            value_str = value_str.translate(_EUROPEAN_AMOUNT_TABLE)
         # If only dot, keep as is (could be thousands or decimal separator)
         # Assume if dot and 2 digits after, it's decimal
 
@@ -1133,16 +1374,21 @@ class LiquidationPDFExtractor:
             return Decimal('0')
 
 
-def extract_liquidation_pdf(pdf_path: str, table_settings: Optional[Dict[str, Any]] = None) -> LiquidationDocument:
+def extract_liquidation_pdf(pdf_path: str, table_settings: Optional[Dict[str, Any]] = None,
+                            max_workers: int = 1, reuse_column_lines: bool = False) -> LiquidationDocument:
     """
     Convenience function to extract a liquidation PDF.
 
     Args:
         pdf_path: Path to PDF file
         table_settings: Optional dictionary of pdfplumber table extraction settings
+        max_workers: Worker processes used to extract the record pages (1 = in-process)
+        reuse_column_lines: Reuse the record table columns detected on the first
+            record page as explicit vertical lines for the others
 
     Returns:
         Extracted LiquidationDocument
     """
-    extractor = LiquidationPDFExtractor(pdf_path, table_settings=table_settings)
+    extractor = LiquidationPDFExtractor(pdf_path, table_settings=table_settings, max_workers=max_workers,
+                                        reuse_column_lines=reuse_column_lines)
     return extractor.extract()
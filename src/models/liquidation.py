@@ -1,13 +1,18 @@
 """
 Data models for liquidation documents (Documentos de Liquidación).
 """
+import sys
 from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import List, Optional, Dict
 from datetime import date
 
+# Records created once per extracted row use __slots__ (no per-instance __dict__)
+# where dataclasses support it (Python 3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class TributeRecord:
     """
     Represents a single tribute charge record (cobro) from the main table.
@@ -41,7 +46,7 @@ class TributeRecord:
                 self.diputacion_recargo)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExerciseSummary:
     """
     Summary of amounts by fiscal year (exercise).
@@ -85,7 +90,7 @@ class ExerciseValidationResult:
     errors: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DeductionDetail:
     """
     Detailed deductions section from page 2.
@@ -129,7 +134,7 @@ class DeductionDetail:
         ])
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AdvanceBreakdown:
     """
     Breakdown of advances by concept (Desglose Descuentos Anticipos).
@@ -150,7 +155,7 @@ class AdvanceBreakdown:
                 self.bice + self.iae + self.tasas + self.ejecutiva)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RefundRecord:
     """
     Individual refund record (Expediente de Devolución).
@@ -166,7 +171,7 @@ class RefundRecord:
     a_deducir: Decimal  # To deduct
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RefundSummary:
     """
     Summary of refunds by concept.
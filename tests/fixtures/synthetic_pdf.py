@@ -0,0 +1,138 @@
+"""
+Minimal liquidation-like PDFs for extractor tests.
+
+The sample PDFs are not part of the repository, so these documents are built
+by hand: text in Helvetica plus ruled tables drawn as lines, which is all the
+extractor relies on. Layout (landscape A4):
+    - Page 1: header text and the record table
+    - Page 2: more records (the table continues, without header row)
+    - Page 3: TOTAL table and deductions, full width with horizontal rules
+    - Page 4: refunds
+"""
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+PAGE_WIDTH = 842
+PAGE_HEIGHT = 595
+FONT_SIZE = 6
+ROW_HEIGHT = 24
+
+# Record table column boundaries (10 columns)
+RECORD_COLUMNS = [20, 170, 250, 350, 410, 470, 530, 590, 650, 710, 800]
+
+RECORD_HEADER = [
+    'CONCEPTO', 'CLAVE', 'CLAVE RECAUDACION', 'VOLUNTARIA', 'EJECUTIVA',
+    'RECARGO', 'DIP. VOL.', 'DIP. EJE.', 'DIP. REC.', 'LIQUIDO'
+]
+
+RECORDS_PAGE_1 = [
+    ['IBI RUSTICA', '2025/E/0000783', '026/2025/20/100/205', '1.500,50', '0,00', '0,00', '0,00', '0,00', '0,00', '1.500,50'],
+    ['IBI URBANA', '2025/E/0000784', '026/2025/20/100/208', '2.000,00', '0,00', '0,00', '0,00', '0,00', '0,00', '2.000,00'],
+]
+RECORDS_PAGE_2 = [
+    ['BASURAS', '2024/E/0000102', '026/2024/20/100/022', '75,00', '0,00', '0,00', '0,00', '0,00', '0,00', '75,00'],
+]
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+class _Page:
+    """Content stream of one page, in top-left coordinates like pdfplumber."""
+
+    def __init__(self):
+        self.ops: List[str] = []
+
+    def text(self, x: float, top: float, text: str):
+        y = PAGE_HEIGHT - top - FONT_SIZE
+        self.ops.append(f'BT /F1 {FONT_SIZE} Tf {x} {y} Td ({_escape(text)}) Tj ET')
+
+    def line(self, x0: float, top0: float, x1: float, top1: float):
+        self.ops.append(f'{x0} {PAGE_HEIGHT - top0} m {x1} {PAGE_HEIGHT - top1} l S')
+
+    def table(self, top: float, columns: Sequence[float], rows: Sequence[Sequence[str]]):
+        """Ruled table: one text line per cell line, rows ROW_HEIGHT tall."""
+        bottom = top + ROW_HEIGHT * len(rows)
+        for row_idx in range(len(rows) + 1):
+            y = top + row_idx * ROW_HEIGHT
+            self.line(columns[0], y, columns[-1], y)
+        for x in columns:
+            self.line(x, top, x, bottom)
+        for row_idx, row in enumerate(rows):
+            for col, cell in enumerate(row):
+                for line_idx, cell_line in enumerate(cell.split('\n')):
+                    self.text(columns[col] + 2, top + row_idx * ROW_HEIGHT + 2 + line_idx * (FONT_SIZE + 1), cell_line)
+
+    def stream(self) -> bytes:
+        return '\n'.join(self.ops).encode('latin-1')
+
+
+def _write_pdf(path: Path, pages: List[_Page]):
+    """Write pages as a PDF with a cross-reference table."""
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,  # Pages, filled in below
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    page_refs = []
+    for page in pages:
+        content = page.stream()
+        objects.append(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R >> >> '
+            b'/Contents %d 0 R >>' % (PAGE_WIDTH, PAGE_HEIGHT, len(objects))
+        )
+        page_refs.append(b'%d 0 R' % len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [' + b' '.join(page_refs) + b'] /Count %d >>' % len(pages)
+
+    data = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(data)
+    data += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        data += b'%010d 00000 n \n' % offset
+    data += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    Path(path).write_bytes(bytes(data))
+
+
+def build_liquidation_pdf(path: Path) -> Path:
+    """
+    Write a 4-page liquidation document to path.
+
+    Returns:
+        The path, for convenience
+    """
+    first = _Page()
+    for idx, line in enumerate([
+        'LIQUIDACION EJERCICIO 2025',
+        'Mandamiento de pago: 2025/123',
+        'Fecha de mandamiento: 15/03/2025',
+        'Número de liquidación: 623',
+        '(026) AYUNTAMIENTO DE EJEMPLO',
+    ]):
+        first.text(20, 20 + idx * 12, line)
+    first.table(100, RECORD_COLUMNS, [RECORD_HEADER] + RECORDS_PAGE_1)
+
+    second = _Page()
+    second.table(40, RECORD_COLUMNS, RECORDS_PAGE_2)
+
+    # Totals and deductions span the full width, with rules between their rows
+    totals = _Page()
+    totals.table(40, [RECORD_COLUMNS[0], 400, RECORD_COLUMNS[-1]], [
+        ['TOTAL', ''],
+        ['VOLUNTARIA 3.575,50\nEJECUTIVA 0,00\nRECARGO 0,00', ''],
+        ['LIQUIDO 3.575,50', ''],
+        ['DEDUCCIONES', 'RECAUDACIÓN'],
+        ['- TASA VOLUNTARIA 12,34\nRECAUDACIÓN', ''],
+    ])
+    totals.text(20, 200, 'A LIQUIDAR 3.563,16')
+
+    refunds = _Page()
+    refunds.text(20, 20, 'DEVOLUCIONES')
+
+    _write_pdf(path, [first, second, totals, refunds])
+    return path
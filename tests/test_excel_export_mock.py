@@ -0,0 +1,172 @@
+"""Test for Excel export functionality with mock data."""
+import re
+import zipfile
+from decimal import Decimal
+from datetime import date
+
+import pytest
+
+pytest.importorskip("xlsxwriter")
+
+from src.exporters.excel_exporter import export_to_excel
+from src.models.liquidation import LiquidationDocument, TributeRecord, ExerciseSummary, DeductionDetail
+
+# Main spreadsheet XML namespace
+NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+records = [
+    TributeRecord(
+        concepto="IBI RUSTICA",
+        clave_contabilidad="2023/E/0000783",
+        clave_recaudacion="026/2023/20/100/205",
+        voluntaria=Decimal("1500.50"),
+        ejecutiva=Decimal("200.00"),
+        recargo=Decimal("50.00"),
+        diputacion_voluntaria=Decimal("150.00"),
+        diputacion_ejecutiva=Decimal("20.00"),
+        diputacion_recargo=Decimal("5.00"),
+        liquido=Decimal("1575.50"),
+        ejercicio=2023
+    ),
+    TributeRecord(
+        # URL-like text must stay plain text, not become a hyperlink
+        concepto="https://www.example.com",
+        clave_contabilidad="2024/E/0000100",
+        clave_recaudacion="026/2024/20/100/208",
+        voluntaria=Decimal("2000.00"),
+        ejecutiva=Decimal("0"),
+        recargo=Decimal("0"),
+        diputacion_voluntaria=Decimal("0"),
+        diputacion_ejecutiva=Decimal("0"),
+        diputacion_recargo=Decimal("0"),
+        liquido=Decimal("2000.00"),
+        ejercicio=2024
+    ),
+]
+
+summaries = [
+    ExerciseSummary(
+        ejercicio=record.ejercicio,
+        voluntaria=record.voluntaria,
+        ejecutiva=record.ejecutiva,
+        recargo=record.recargo,
+        diputacion_voluntaria=record.diputacion_voluntaria,
+        diputacion_ejecutiva=record.diputacion_ejecutiva,
+        diputacion_recargo=record.diputacion_recargo,
+        liquido=record.liquido,
+        records=[record]
+    )
+    for record in records
+]
+
+doc = LiquidationDocument(
+    ejercicio=2024,
+    mandamiento_pago="MP-2024-001",
+    fecha_mandamiento=date(2024, 12, 15),
+    numero_liquidacion="LIQ-2024-12345",
+    entidad="AYUNTAMIENTO DE EJEMPLO",
+    codigo_entidad="026",
+    tribute_records=records,
+    exercise_summaries=summaries,
+    total_voluntaria=sum(r.voluntaria for r in records),
+    total_ejecutiva=sum(r.ejecutiva for r in records),
+    total_recargo=sum(r.recargo for r in records),
+    total_diputacion_voluntaria=sum(r.diputacion_voluntaria for r in records),
+    total_diputacion_ejecutiva=sum(r.diputacion_ejecutiva for r in records),
+    total_diputacion_recargo=sum(r.diputacion_recargo for r in records),
+    total_liquido=sum(r.liquido for r in records),
+    deductions=DeductionDetail(tasa_voluntaria=Decimal("12.34")),
+    a_liquidar=sum(r.liquido for r in records)
+)
+
+
+def read_workbook(path):
+    """
+    Read an .xlsx file with the standard library.
+
+    Returns:
+        Tuple of ({sheet name: {cell ref: (value, is_number, style index)}},
+        sheet XML by name, styles XML)
+    """
+    import xml.etree.ElementTree as ET
+
+    with zipfile.ZipFile(path) as xlsx:
+        workbook = ET.fromstring(xlsx.read('xl/workbook.xml'))
+        names = [sheet.get('name') for sheet in workbook.iter(NS + 'sheet')]
+
+        shared = []
+        if 'xl/sharedStrings.xml' in xlsx.namelist():
+            for si in ET.fromstring(xlsx.read('xl/sharedStrings.xml')).iter(NS + 'si'):
+                shared.append(''.join(t.text or '' for t in si.iter(NS + 't')))
+
+        sheets = {}
+        sheets_xml = {}
+        for idx, name in enumerate(names, start=1):
+            xml = xlsx.read(f'xl/worksheets/sheet{idx}.xml').decode('utf-8')
+            sheets_xml[name] = xml
+            cells = {}
+            for c in ET.fromstring(xml).iter(NS + 'c'):
+                kind = c.get('t')
+                if kind == 's':
+                    value = shared[int(c.find(NS + 'v').text)]
+                elif kind == 'inlineStr':
+                    value = ''.join(t.text or '' for t in c.iter(NS + 't'))
+                elif kind == 'str':
+                    value = c.find(NS + 'v').text
+                else:
+                    v = c.find(NS + 'v')
+                    value = float(v.text) if v is not None else None
+                cells[c.get('r')] = (value, kind is None and value is not None, int(c.get('s', 0)))
+            sheets[name] = cells
+
+        styles = xlsx.read('xl/styles.xml').decode('utf-8')
+
+    return sheets, sheets_xml, styles
+
+
+def cell_fill(styles, style_idx):
+    """Background colour (ARGB) of a cell style, or None."""
+    import xml.etree.ElementTree as ET
+
+    root = ET.fromstring(styles)
+    xf = list(root.find(NS + 'cellXfs'))[style_idx]
+    fill = list(root.find(NS + 'fills'))[int(xf.get('fillId', 0))]
+    fg = fill.find(f'{NS}patternFill/{NS}fgColor')
+    return fg.get('rgb') if fg is not None else None
+
+
+def test_excel_export(tmp_path):
+    output = tmp_path / "export.xlsx"
+    export_to_excel(doc, str(output))
+
+    sheets, sheets_xml, styles = read_workbook(output)
+
+    assert list(sheets) == ['Información', 'Registros de Cobros', 'Resumen por Ejercicio', 'Deducciones']
+
+    # Headers
+    registros = sheets['Registros de Cobros']
+    assert registros['A1'][0] == 'Ejercicio'
+    assert registros['B1'][0] == 'Concepto'
+    assert registros['K1'][0] == 'Líquido'
+    assert sheets['Información']['A1'][0] == 'Campo'
+    assert sheets['Deducciones']['B1'][0] == 'Importe'
+
+    # Amounts are written as numbers, text as text
+    assert registros['E2'][:2] == (1500.5, True)
+    assert registros['K3'][:2] == (2000.0, True)
+    assert registros['A2'][:2] == (2023, True)
+    assert registros['D2'][:2] == ('026/2023/20/100/205', False)
+    assert sheets['Deducciones']['B3'][:2] == (12.34, True)
+
+    # URL-like strings stay plain strings
+    assert registros['B3'][:2] == ('https://www.example.com', False)
+    assert '<hyperlink' not in sheets_xml['Registros de Cobros']
+
+    # The TOTAL row of the exercise summary is highlighted, regular rows are not
+    resumen = sheets['Resumen por Ejercicio']
+    assert resumen['A4'][0] == 'TOTAL'
+    assert resumen['H4'][:2] == (3575.5, True)
+    assert cell_fill(styles, resumen['A4'][2]) == 'FFD9E1F2'
+    assert cell_fill(styles, resumen['H4'][2]) == 'FFD9E1F2'
+    assert cell_fill(styles, resumen['A2'][2]) != 'FFD9E1F2'
+    assert re.search(r'<pane [^>]*ySplit="1"', sheets_xml['Resumen por Ejercicio'])
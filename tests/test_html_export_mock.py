@@ -174,3 +174,67 @@ except Exception as e:
     print(f"\n[ERROR] Error during export: {e}")
     import traceback
     traceback.print_exc()
+
+
+def test_failed_export_keeps_previous_file(tmp_path, monkeypatch):
+    """A failure while rendering leaves an earlier export untouched."""
+    from src.exporters.html_grouped_exporter import HTMLGroupedExporter
+
+    output = tmp_path / "export.html"
+    export_grouped_to_html(doc, config, str(output))
+    previous = output.read_text(encoding='utf-8')
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(HTMLGroupedExporter, '_generate_html', fail)
+    try:
+        export_grouped_to_html(doc, config, str(output))
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("export should have failed")
+
+    assert output.read_text(encoding='utf-8') == previous
+    assert [p.name for p in tmp_path.iterdir()] == ["export.html"]
+
+
+def test_compressed_export_matches_plain(tmp_path, monkeypatch):
+    """compress=True writes a .html.gz holding the same text as the plain export."""
+    import gzip
+    from datetime import datetime
+    from src.exporters import html_grouped_exporter
+
+    class FixedDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2024, 12, 20, 10, 30)
+
+    # Both exports must show the same export date
+    monkeypatch.setattr(html_grouped_exporter, 'datetime', FixedDateTime)
+
+    plain = tmp_path / "export.html"
+    compressed = tmp_path / "export.html.gz"
+    export_grouped_to_html(doc, config, str(plain))
+    export_grouped_to_html(doc, config, str(compressed), compress=True)
+
+    with gzip.open(compressed, 'rt', encoding='utf-8') as f:
+        assert f.read() == plain.read_text(encoding='utf-8')
+
+
+def test_group_names_are_escaped(tmp_path):
+    """Group names and texto SICAL are HTML-escaped, onclick arguments JS- then HTML-escaped."""
+    special_config = GroupingConfig()
+    special_config.concept_names = {"208": "IBI & <RUSTICA> 'R'"}
+
+    output = tmp_path / "export.html"
+    export_grouped_to_html(doc, special_config, str(output), group_by_year=True,
+                           group_by_concept=True, group_by_custom=False)
+    html = output.read_text(encoding='utf-8')
+
+    escaped_name = "IBI &amp; &lt;RUSTICA&gt; &#x27;R&#x27;"
+    assert f"<strong>{escaped_name}</strong>" in html
+    assert f'<span class="texto-sical">OPAEF. REGULARIZACION COBROS 2023 - {escaped_name} LIQ.' in html
+    assert ("onclick=\"copyToClipboard('OPAEF. REGULARIZACION COBROS 2023 - "
+            "IBI &amp; &lt;RUSTICA&gt; \\&#x27;R\\&#x27; LIQ.") in html
+    assert "<RUSTICA>" not in html
@@ -0,0 +1,63 @@
+"""Extraction tests on a synthetic liquidation PDF (see tests/fixtures/synthetic_pdf.py)."""
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from src.extractors.pdf_extractor import extract_liquidation_pdf
+from tests.fixtures.synthetic_pdf import build_liquidation_pdf
+
+EXPECTED_RECORDS = [
+    ('IBI RUSTICA', '2025/E/0000783', Decimal('1500.50'), 2025),
+    ('IBI URBANA', '2025/E/0000784', Decimal('2000.00'), 2025),
+    ('BASURAS', '2024/E/0000102', Decimal('75.00'), 2024),
+]
+
+
+def summary(doc):
+    """Records and totals of a document, for comparisons."""
+    records = [(r.concepto, r.clave_contabilidad, r.liquido, r.ejercicio) for r in doc.tribute_records]
+    return records, doc.total_liquido, doc.a_liquidar, doc.deductions.tasa_voluntaria
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    return str(build_liquidation_pdf(tmp_path / "liquidacion.pdf"))
+
+
+def test_extract(pdf_path):
+    doc = extract_liquidation_pdf(pdf_path)
+
+    assert doc.ejercicio == 2025
+    assert doc.numero_liquidacion == '623'
+    assert summary(doc) == (EXPECTED_RECORDS, Decimal('3575.50'), Decimal('3563.16'), Decimal('12.34'))
+
+
+def test_reused_column_lines_skip_non_record_pages(pdf_path):
+    """The totals/deductions page is not read as records with the reused column lines."""
+    doc = extract_liquidation_pdf(pdf_path, reuse_column_lines=True)
+
+    assert summary(doc) == summary(extract_liquidation_pdf(pdf_path))
+
+
+def test_parallel_extraction(pdf_path):
+    """Record pages extracted in worker processes give the same document."""
+    doc = extract_liquidation_pdf(pdf_path, max_workers=2)
+
+    assert summary(doc) == summary(extract_liquidation_pdf(pdf_path))
+
+
+def test_parallel_extraction_falls_back_when_pool_fails(pdf_path, monkeypatch):
+    """A worker pool that cannot run falls back to in-process extraction."""
+    from concurrent.futures.process import BrokenProcessPool
+    from src.extractors import pdf_extractor
+
+    class BrokenPool:
+        def __init__(self, *args, **kwargs):
+            raise BrokenProcessPool("cannot start workers")
+
+    monkeypatch.setattr(pdf_extractor, 'ProcessPoolExecutor', BrokenPool)
+    doc = extract_liquidation_pdf(pdf_path, max_workers=2)
+
+    assert summary(doc)[0] == EXPECTED_RECORDS